@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 import os
-from jinja2 import Environment, FileSystemLoader
+import sys
+import json
+import shutil
+import fnmatch
+import time
+import hashlib
+import argparse
 import datetime
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 
 NEW_NAME                = "gtk4matjar"
 VERSION                 = "0.1beta"
@@ -13,7 +21,7 @@ DEV_EMAIL               = "example@exampleee.com"
 ID_NAME                 = "com.github.yucefsourani.gtk4matjar"
 COMMENT                 = "TEST COMMENT"
 COPYRIGHT               = "© 2026 Developer"
-HOMEPAGE_WEB            = "https://github.com/yucefsourani/gtk4matjar" 
+HOMEPAGE_WEB            = "https://github.com/yucefsourani/gtk4matjar"
 WEBSITE                 = "https://github.com/yucefsourani/gtk4matjar" # git repository link
 ISSUESITE               = "https://github.com/yucefsourani/gtk4matjar"
 LICENSE                 = 10 #https://lazka.github.io/pgi-docs/#Gtk-4.0/enums.html#Gtk.License
@@ -48,83 +56,604 @@ data = {"NEW_NAME"                : NEW_NAME ,
         "TRANSLATOR_CREDITS"      : TRANSLATOR_CREDITS
         }
 
-env = Environment(loader=FileSystemLoader('.'))
-
-files = ["src/gtk4matjar/paths.py",
-         "src/gtk4matjar/__main__.py",
-         "src/gtk4matjar/application.py",
-         "src/gtk4matjar/window.py",
-         "src/gtk4matjar/gstreamer.py",
-         "src/gtk4matjar.egg-info/entry_points.txt",
-         "src/gtk4matjar.egg-info/top_level.txt",
-         "src/gtk4matjar.egg-info/SOURCES.txt",
-         "src/gtk4matjar.egg-info/PKG-INFO",
-         "pyproject.toml",
-         "pyinstaller/gtk4matjar.spec",
-         "flatpak/com.example.gtk4matjar.yml",
-         "meson.build",
-         "bin/gtk4matjar.in",
-         "data/com.example.gtk4matjar.desktop.in",
-         "data/com.example.gtk4matjar.metainfo.xml.in",
-         "data/com.example.gtk4matjar.gschema.xml",
-         "TMPREADME.md",
-         "MANIFEST.in",
-         ".github/workflows/build-windows.yml",
-         "src/gtk4matjar/resources/gtk4matjar.gresource.xml",
-         "src/gtk4matjar/resources/ui/window.ui",
-         "po/POTFILES.in",
-         "po/meson.build"
-        ]
-for f in files:
-    template = env.get_template(f)
-    output = template.render(data)
-    with open(f, 'w') as nf:
-        nf.write(output)
-
-
-
-def remove_file(file_location):
-    if os.path.isfile(file_location):
-        return os.remove(file_location)
-
-
-
-
-folders = [("src/gtk4matjar/resources/gtk4matjar.gresource.xml",f"src/gtk4matjar/resources/{NEW_NAME}.gresource.xml"),
-          ("src/gtk4matjar",f"src/{NEW_NAME}"),
-          ("src/gtk4matjar.egg-info",f"src/{NEW_NAME}.egg-info"),
-          ("pyinstaller/gtk4matjar.spec",f"pyinstaller/{NEW_NAME}.spec"),
-          ("flatpak/com.example.gtk4matjar.yml",f"flatpak/{ID_NAME}.yml"),
-          ("bin/gtk4matjar.in",f"bin/{NEW_NAME}.in"),
-          ("data/com.example.gtk4matjar.desktop.in",f"data/{ID_NAME}.desktop.in"),
-          ("data/icons/hicolor/scalable/apps/com.example.gtk4matjar.svg",f"data/icons/hicolor/scalable/apps/{ID_NAME}.svg"),
-          ("data/icons/Adwaita/scalable/apps/com.example.gtk4matjar.svg",f"data/icons/Adwaita/scalable/apps/{ID_NAME}.svg"),
-          ("data/icons/hicolor/symbolic/apps/com.example.gtk4matjar-symbolic.svg",f"data/icons/hicolor/symbolic/apps/{ID_NAME}-symbolic.svg"),
-          ("data/icons/Adwaita/symbolic/apps/com.example.gtk4matjar-symbolic.svg",f"data/icons/Adwaita/symbolic/apps/{ID_NAME}-symbolic.svg"),
-          ("data/icons/com.example.gtk4matjar.ico",f"data/icons/{ID_NAME}.ico"),
-          ("data/icons/com.example.gtk4matjar.icns",f"data/icons/{ID_NAME}.icns"),
-          ("data/com.example.gtk4matjar.metainfo.xml.in",f"data/{ID_NAME}.metainfo.xml.in"),
-          ("data/com.example.gtk4matjar.gschema.xml",f"data/{ID_NAME}.gschema.xml"),
-          ("TMPREADME.md","README.md"),
-         ]
-         
-for i in folders : 
-    f,nf = i
-    f  = Path(i[0])
-    nf = Path(i[1])
-    if f.exists():
-        f.rename(nf)
-        print(f"Rename {f}-->{nf}")
-
-
-remove_file("Screenshot1.png")
-remove_file("Screenshot2.png")
-print("\nDone.")
-    
-        
-
-
-
-        
+TEMPLATE_DIR = Path(__file__).resolve().parent
 
+# Compiled templates, shared by every run and worker process
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "create_py_gtk4temp"
 
+# Files containing one of these are rendered with Jinja, every other file is copied
+TEMPLATE_MARKERS = (b"{{", b"{%", b"{#")
+
+# Copied as is even if they contain one of the markers
+raw_files = []
+
+# Scan results, reused while a file keeps its mtime and size
+SCAN_CACHE_VERSION = 1
+
+# Template files that are not part of a generated project
+removed_files = ["Screenshot1.png", "Screenshot2.png"]
+
+# Staging directory and journal, inside each project while it is generated
+STAGING_DIR_NAME = ".create_py_gtk4temp-staging"
+
+# Never copied into a generated project
+excluded_names = {".git", "__pycache__", Path(__file__).name, STAGING_DIR_NAME}
+
+
+def make_data(overrides=None):
+    """Template variables: the values above, updated with overrides."""
+    values = dict(data)
+    if overrides:
+        values.update(overrides)
+        if "ID_NAME" in overrides and "GIORESOURCE_ID" not in overrides:
+            values["GIORESOURCE_ID"] = "/" + "/".join(values["ID_NAME"].split("."))
+    return values
+
+
+def get_renames(values):
+    """Template paths renamed for a project, applied in order."""
+    name, id_name = values["NEW_NAME"], values["ID_NAME"]
+    return [("src/gtk4matjar/resources/gtk4matjar.gresource.xml",f"src/gtk4matjar/resources/{name}.gresource.xml"),
+            ("src/gtk4matjar",f"src/{name}"),
+            ("src/gtk4matjar.egg-info",f"src/{name}.egg-info"),
+            ("pyinstaller/gtk4matjar.spec",f"pyinstaller/{name}.spec"),
+            ("flatpak/com.example.gtk4matjar.yml",f"flatpak/{id_name}.yml"),
+            ("bin/gtk4matjar.in",f"bin/{name}.in"),
+            ("data/com.example.gtk4matjar.desktop.in",f"data/{id_name}.desktop.in"),
+            ("data/icons/hicolor/scalable/apps/com.example.gtk4matjar.svg",f"data/icons/hicolor/scalable/apps/{id_name}.svg"),
+            ("data/icons/Adwaita/scalable/apps/com.example.gtk4matjar.svg",f"data/icons/Adwaita/scalable/apps/{id_name}.svg"),
+            ("data/icons/hicolor/symbolic/apps/com.example.gtk4matjar-symbolic.svg",f"data/icons/hicolor/symbolic/apps/{id_name}-symbolic.svg"),
+            ("data/icons/Adwaita/symbolic/apps/com.example.gtk4matjar-symbolic.svg",f"data/icons/Adwaita/symbolic/apps/{id_name}-symbolic.svg"),
+            ("data/icons/com.example.gtk4matjar.ico",f"data/icons/{id_name}.ico"),
+            ("data/icons/com.example.gtk4matjar.icns",f"data/icons/{id_name}.icns"),
+            ("data/com.example.gtk4matjar.metainfo.xml.in",f"data/{id_name}.metainfo.xml.in"),
+            ("data/com.example.gtk4matjar.gschema.xml",f"data/{id_name}.gschema.xml"),
+            ("TMPREADME.md","README.md"),
+           ]
+
+
+def destination_path(rel_path, renames):
+    """Path of a template file inside the generated project."""
+    for source, target in renames:
+        if rel_path == source or rel_path.startswith(source + "/"):
+            rel_path = target + rel_path[len(source):]
+    return rel_path
+
+
+# Worker process state, set by init_worker()
+_env = None
+
+
+def init_worker(template_dir, cache_dir):
+    """Create the Jinja environment once per process."""
+    global _env
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _env = Environment(loader=FileSystemLoader(str(template_dir)),
+                       bytecode_cache=FileSystemBytecodeCache(str(cache_dir)))
+
+
+def read_exclude_patterns():
+    """
+    Patterns of files never treated as part of the template.
+
+    Read from .gitignore and the exclude, global-exclude, recursive-exclude
+    and prune lines of MANIFEST.in.
+
+    Returns:
+        list: (pattern, anchored, directories only) tuples
+    """
+    patterns = []
+    try:
+        with open(TEMPLATE_DIR / ".gitignore", "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith(("#", "!")):
+                    continue
+                dir_only = line.endswith("/")
+                line = line.rstrip("/")
+                patterns.append((line.lstrip("/"), "/" in line, dir_only))
+    except OSError:
+        pass
+
+    try:
+        with open(TEMPLATE_DIR / "MANIFEST.in", "r", encoding="utf-8") as f:
+            for line in f:
+                command, *args = line.split() or [""]
+                if command == "global-exclude":
+                    patterns.extend((arg, False, False) for arg in args)
+                elif command == "exclude":
+                    patterns.extend((arg.strip("/"), True, False) for arg in args)
+                elif command == "prune":
+                    patterns.extend((arg.strip("/"), True, True) for arg in args)
+                elif command == "recursive-exclude" and args:
+                    # fnmatch's * also matches "/", so dir/*/name covers every depth
+                    directory = args[0].strip("/")
+                    for arg in args[1:]:
+                        patterns.extend([(f"{directory}/{arg}", True, False),
+                                         (f"{directory}/*/{arg}", True, False)])
+    except OSError:
+        pass
+    return patterns
+
+
+def is_excluded(rel_path, is_dir, patterns):
+    name = rel_path.rsplit("/", 1)[-1]
+    for pattern, anchored, dir_only in patterns:
+        if dir_only and not is_dir:
+            continue
+        if fnmatch.fnmatch(rel_path if anchored else name, pattern):
+            return True
+    return False
+
+
+def has_template_markers(path):
+    """Byte level check for Jinja markers, without parsing. Binary files never match."""
+    tail = b""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            if b"\0" in chunk:
+                return False
+            data = tail + chunk
+            if any(marker in data for marker in TEMPLATE_MARKERS):
+                return True
+            tail = chunk[-1:]
+    return False
+
+
+def scan_template(cache_dir=CACHE_DIR, excluded_dirs=()):
+    """
+    Find the files of the template and which of them contain Jinja markers.
+
+    The tree is walked once, skipping ignored and excluded files. Files are
+    only read when their mtime or size changed since the last scan.
+
+    Args:
+        cache_dir: Directory of the scan cache
+        excluded_dirs: Resolved directories never scanned
+
+    Returns:
+        tuple: (files to render, files to copy), paths relative to TEMPLATE_DIR
+    """
+    cache_file = Path(cache_dir) / "scan.json"
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") != SCAN_CACHE_VERSION or cache.get("root") != str(TEMPLATE_DIR):
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    cached = cache.get("files", {})
+
+    patterns = read_exclude_patterns()
+    scanned = {}
+    templates, others = [], []
+    for root, dirs, names in os.walk(TEMPLATE_DIR):
+        rel_root = Path(root).relative_to(TEMPLATE_DIR).as_posix()
+        rel_root = "" if rel_root == "." else rel_root + "/"
+        dirs[:] = sorted(d for d in dirs
+                         if d not in excluded_names and (Path(root) / d).resolve() not in excluded_dirs
+                         and not is_excluded(rel_root + d, True, patterns))
+        for name in sorted(names):
+            rel_path = rel_root + name
+            if name in excluded_names or is_excluded(rel_path, False, patterns):
+                continue
+            path = Path(root) / name
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entry = cached.get(rel_path)
+            if entry is None or entry[:2] != [stat.st_mtime_ns, stat.st_size]:
+                try:
+                    entry = [stat.st_mtime_ns, stat.st_size, has_template_markers(path)]
+                except OSError as e:
+                    print(f"Warning: Failed to read {rel_path}: {e}")
+                    continue
+            scanned[rel_path] = entry
+            (templates if entry[2] and rel_path not in raw_files else others).append(rel_path)
+
+    if scanned != cached:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": SCAN_CACHE_VERSION, "root": str(TEMPLATE_DIR), "files": scanned}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"Warning: Failed to write scan cache: {e}")
+    return templates, others
+
+
+def file_hash(path):
+    """sha256 of a file, None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def stage_render(source, values, target, staged, dry_run=False):
+    """
+    Stream a rendered template into its staging file.
+
+    The staging file is kept only if the output differs from the target.
+
+    Returns:
+        str or None: Hash of the staged output, None if the target is unchanged
+    """
+    digest = hashlib.sha256()
+    if dry_run:
+        for chunk in _env.get_template(source).generate(values):
+            digest.update(chunk.encode("utf-8"))
+    else:
+        with open(staged, "wb") as f:
+            for chunk in _env.get_template(source).generate(values):
+                chunk = chunk.encode("utf-8")
+                digest.update(chunk)
+                f.write(chunk)
+    output_hash = digest.hexdigest()
+    if output_hash == file_hash(target):
+        if not dry_run:
+            os.remove(staged)
+        return None
+    return output_hash
+
+
+def stage_copy(source, target, staged, dry_run=False):
+    """
+    Copy a file into staging unless the target has the same size and mtime.
+
+    Returns:
+        str or None: "copy" when staged, None if the target is unchanged
+    """
+    try:
+        stat, target_stat = os.stat(source), os.stat(target)
+        if stat.st_size == target_stat.st_size and int(stat.st_mtime) == int(target_stat.st_mtime):
+            return None
+    except OSError:
+        pass
+    if not dry_run:
+        shutil.copy2(source, staged)
+    return "copy"
+
+
+def stage_operation(operation, values, staging_dir, dry_run=False):
+    """Run the staging step of one planned operation, in a worker."""
+    staged = os.path.join(staging_dir, str(operation["index"]))
+    if operation["action"] == "render":
+        return stage_render(operation["source"], values, operation["target"], staged, dry_run)
+    return stage_copy(operation["source"], operation["target"], staged, dry_run)
+
+
+def list_copies(output_dir, renames, template_files, other_files):
+    """
+    List the files that are not templates, with their project destination.
+
+    Returns:
+        list: (source path, destination path) tuples
+    """
+    copies = []
+    # Rendered templates replace files at their destination (TMPREADME.md -> README.md)
+    rendered = {destination_path(f, renames) for f in template_files}
+    for rel_path in other_files:
+        if rel_path in removed_files:
+            continue
+        dest_rel_path = destination_path(rel_path, renames)
+        if dest_rel_path in rendered:
+            continue
+        copies.append((str(TEMPLATE_DIR / rel_path), str(Path(output_dir) / dest_rel_path)))
+    return copies
+
+
+def build_plan(projects, cache_dir=CACHE_DIR):
+    """
+    Build the complete plan of every project, without touching the disk.
+
+    Returns:
+        list: One dict per project: name, root, values and operations
+              (render, copy, rename, delete) in commit order
+    """
+    output_dirs = {Path(output_dir).resolve() for _values, output_dir in projects if output_dir is not None}
+    excluded_dirs = output_dirs | {Path(cache_dir).resolve()}
+    template_files, other_files = scan_template(cache_dir, excluded_dirs)
+    plan = []
+    for values, output_dir in projects:
+        renames = get_renames(values)
+        root = Path(output_dir).resolve() if output_dir is not None else TEMPLATE_DIR
+        operations = []
+        if output_dir is None:
+            # In place: render over the templates, then rename and delete
+            for f in template_files:
+                operations.append({"action": "render", "source": f, "target": str(TEMPLATE_DIR / f)})
+            for source, target in renames:
+                if source != target:
+                    operations.append({"action": "rename", "source": str(TEMPLATE_DIR / source),
+                                       "target": str(TEMPLATE_DIR / target)})
+            for name in removed_files:
+                operations.append({"action": "delete", "target": str(TEMPLATE_DIR / name)})
+        else:
+            for source, target in list_copies(root, renames, template_files, other_files):
+                operations.append({"action": "copy", "source": source, "target": target})
+            for f in template_files:
+                operations.append({"action": "render", "source": f,
+                                   "target": str(root / destination_path(f, renames))})
+        for index, operation in enumerate(operations):
+            operation["index"] = index
+        plan.append({"name": values["NEW_NAME"], "root": str(root), "values": values,
+                     "operations": operations})
+    return plan
+
+
+def plan_hash(project):
+    """Identify a project plan, a journal is only resumed for the same plan."""
+    encoded = json.dumps([project["values"], project["operations"]], sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class Journal:
+    """
+    Staging directory and progress log of one project.
+
+    Lives next to the project so commits are same-filesystem renames.
+    Each staged and committed operation is appended to a log, so an
+    interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, project):
+        self.staging_dir = Path(project["root"]) / STAGING_DIR_NAME
+        self.path = self.staging_dir / "journal.log"
+        self.plan_hash = plan_hash(project)
+        self.staged = {}
+        self.committed = set()
+
+    def open(self):
+        """Load a journal of the same plan, or start a new one."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            lines = []
+        if lines and lines[0] == self.plan_hash:
+            for line in lines[1:]:
+                state, _sep, rest = line.partition(" ")
+                index, _sep, result = rest.partition(" ")
+                if state == "staged":
+                    self.staged[int(index)] = result or None
+                elif state == "committed":
+                    self.committed.add(int(index))
+            return bool(self.staged or self.committed)
+
+        if self.staging_dir.exists():
+            shutil.rmtree(self.staging_dir)
+        self.staging_dir.mkdir(parents=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(self.plan_hash + "\n")
+        return False
+
+    def record(self, state, index, result=None):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(f"{state} {index} {result or ''}".rstrip() + "\n")
+        if state == "staged":
+            self.staged[index] = result
+        else:
+            self.committed.add(index)
+
+    def close(self):
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+
+def stage(plan, journals, jobs=None, cache_dir=CACHE_DIR, dry_run=False):
+    """
+    Phase one: render and copy every changed file into staging.
+
+    Nothing outside the staging directories is modified.
+
+    Returns:
+        dict: (project index, operation index) -> result, None when unchanged
+    """
+    tasks = []
+    for project_index, (project, journal) in enumerate(zip(plan, journals)):
+        for operation in project["operations"]:
+            if operation["action"] not in ("render", "copy"):
+                continue
+            index = operation["index"]
+            if journal is not None and (index in journal.committed or index in journal.staged):
+                continue
+            staging_dir = str(journal.staging_dir) if journal is not None else ""
+            tasks.append(((project_index, index), operation, project["values"], staging_dir))
+
+    results = {}
+    if tasks:
+        jobs = jobs or min(os.cpu_count() or 1, len(tasks)) or 1
+        keys = [task[0] for task in tasks]
+        arguments = [task[1:] for task in tasks]
+        if jobs == 1:
+            init_worker(TEMPLATE_DIR, cache_dir)
+            outputs = [stage_operation(*args, dry_run) for args in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                     initargs=(TEMPLATE_DIR, cache_dir)) as executor:
+                outputs = list(executor.map(stage_operation, *zip(*arguments), [dry_run] * len(arguments),
+                                            chunksize=max(1, len(arguments) // (jobs * 4))))
+        for (project_index, index), result in zip(keys, outputs):
+            results[(project_index, index)] = result
+            if not dry_run:
+                journals[project_index].record("staged", index, result)
+
+    for project_index, journal in enumerate(journals):
+        if journal is not None:
+            for index, result in journal.staged.items():
+                results.setdefault((project_index, index), result)
+    return results
+
+
+def commit(project, journal):
+    """
+    Phase two: move staged files into place, then rename and delete.
+
+    Every step is a single atomic rename or unlink, logged as it completes.
+
+    Returns:
+        int: Number of operations committed
+    """
+    committed = 0
+    for operation in project["operations"]:
+        index = operation["index"]
+        if index in journal.committed:
+            continue
+        action = operation["action"]
+        target = Path(operation["target"])
+        if action in ("render", "copy"):
+            if journal.staged.get(index) is not None:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(journal.staging_dir / str(index), target)
+                committed += 1
+        elif action == "rename":
+            source = Path(operation["source"])
+            if source.exists():
+                source.rename(target)
+                print(f"Rename {source}-->{target}")
+                committed += 1
+        elif action == "delete":
+            if target.is_file():
+                os.remove(target)
+                committed += 1
+        journal.record("committed", index)
+    return committed
+
+
+def print_plan(plan, results):
+    for project_index, project in enumerate(plan):
+        print(f"{project['name']}: {project['root']}")
+        for operation in project["operations"]:
+            action = operation["action"]
+            if action in ("render", "copy"):
+                state = "unchanged" if results.get((project_index, operation["index"])) is None else "write"
+                print(f"  {action:6} {state:9} {operation['source']} -> {operation['target']}")
+            elif action == "rename":
+                print(f"  rename           {operation['source']} -> {operation['target']}")
+            else:
+                print(f"  delete           {operation['target']}")
+
+
+def generate(projects, jobs=None, cache_dir=CACHE_DIR, dry_run=False):
+    """
+    Generate projects in two phases: stage everything, then commit.
+
+    Args:
+        projects: List of (variables, output directory or None for in place)
+        jobs: Worker processes, 1 renders in this process
+        cache_dir: Jinja bytecode cache directory
+        dry_run: Print the plan and what would change, write nothing
+
+    Returns:
+        tuple: (files written, files unchanged)
+    """
+    timings = {}
+    start = time.perf_counter()
+    plan = build_plan(projects, cache_dir)
+    timings["plan"] = time.perf_counter() - start
+
+    journals = [None] * len(plan)
+    if not dry_run:
+        journals = [Journal(project) for project in plan]
+        for project, journal in zip(plan, journals):
+            if journal.open():
+                print(f"{project['name']}: resuming interrupted generation")
+
+    start = time.perf_counter()
+    results = stage(plan, journals, jobs, cache_dir, dry_run)
+    timings["stage"] = time.perf_counter() - start
+
+    written = sum(1 for result in results.values() if result is not None)
+    unchanged = len(results) - written
+
+    if dry_run:
+        print_plan(plan, results)
+    else:
+        start = time.perf_counter()
+        for project, journal in zip(plan, journals):
+            commit(project, journal)
+            journal.close()
+        timings["commit"] = time.perf_counter() - start
+
+    operations = sum(len(project["operations"]) for project in plan)
+    print(f"\n{len(plan)} projects, {operations} operations: " +
+          ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+    return written, unchanged
+
+
+def load_manifest(path):
+    """
+    Read a batch manifest.
+
+    The manifest is a JSON list of variable sets, or an object with
+    "defaults" applied to every entry of "projects". An entry may name its
+    own "output" directory, relative to the manifest.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"projects": manifest}
+    base_dir = Path(path).resolve().parent
+    projects = []
+    for entry in manifest.get("projects", []):
+        entry = dict(manifest.get("defaults", {}), **entry)
+        output = entry.pop("output", None)
+        projects.append((entry, base_dir / output if output else None))
+    return projects
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create a project from the GTK4 template.")
+    parser.add_argument("--output", "-o", type=Path,
+                        help="Generate into this directory instead of converting the template in place "
+                             "(with --manifest: parent directory of the projects)")
+    parser.add_argument("--manifest", "-m", type=Path,
+                        help="JSON file with the variable sets of several projects to generate")
+    parser.add_argument("--set", "-s", action="append", default=[], metavar="KEY=VALUE",
+                        help="Override a template variable (repeatable)")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR,
+                        help="Jinja bytecode cache directory")
+    parser.add_argument("--dry-run", "-n", action="store_true",
+                        help="Print the plan and which files would change, write nothing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    overrides = {}
+    for item in args.set:
+        key, _sep, value = item.partition("=")
+        overrides[key] = value
+
+    if args.manifest:
+        projects = []
+        for entry, output_dir in load_manifest(args.manifest):
+            values = make_data(dict(entry, **overrides))
+            if output_dir is None:
+                output_dir = (args.output or Path.cwd()) / values["NEW_NAME"]
+            projects.append((values, output_dir))
+    else:
+        projects = [(make_data(overrides), args.output)]
+
+    written, unchanged = generate(projects, args.jobs, args.cache_dir, args.dry_run)
+    if args.dry_run:
+        print(f"{written} files would be written, {unchanged} unchanged.")
+        return 0
+    for values, output_dir in projects:
+        print(f"{values['NEW_NAME']}: {output_dir or TEMPLATE_DIR}")
+    print(f"{written} files written, {unchanged} unchanged.")
+    print("Done.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
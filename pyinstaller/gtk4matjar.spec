@@ -107,18 +107,39 @@ hiddenimports = [
 # Collect all gi submodules
 hiddenimports += collect_submodules('gi')
 
-# SQLModel, SQLAlchemy, Pydantic imports
+# SQLModel, SQLAlchemy, Pydantic imports come from hooks/hook-sqlmodel.py:
+# the set recorded by trace_imports.py, or every submodule with
+# PYI_FULL_HIDDENIMPORTS=1. Subpackages the trace never imported
+# (other database dialects, asyncio, pydantic.v1...) are left out.
 hiddenimports += collect_submodules('sqlite3')
-hiddenimports += collect_submodules('sqlmodel')
-hiddenimports += collect_submodules('sqlalchemy')
-hiddenimports += collect_submodules('pydantic')
-hiddenimports += collect_submodules('pydantic_core')
-hiddenimports += [
-    'greenlet',
-    'typing_extensions',
-    'annotated_types',
+sys.path.insert(0, str(SPEC_DIR))
+from trace_imports import load_trace
+from profile_gstreamer import (ESSENTIAL_PLUGINS, dependency_search_dirs, load_profile, plugin_binaries,
+                               plugin_name, select_plugins, size_report)
+import_trace = load_trace(warn=lambda message: None)
+sqlmodel_excludes = import_trace['excludes'] if import_trace else []
+
+# GStreamer plugins recorded by profile_gstreamer.py, None to use the lists below
+gst_profile = load_profile()
+
+
+# Plugins go in binaries so PyInstaller also collects their dependencies
+gst_binaries = []
 
-]
+
+def gstreamer_binaries(candidates, available):
+    """
+    Binaries entries for the bundled plugins.
+
+    With a profile, the profiled plugins and the essential ones the app's
+    helpers need replace the candidates, and the libraries they depend on
+    are added explicitly.
+    """
+    if gst_profile is None:
+        return [(str(plugin), 'lib/gstreamer-1.0') for plugin in candidates]
+    selected = select_plugins(available, gst_profile, always=[plugin_name(name) for name in ESSENTIAL_PLUGINS])
+    print(size_report(selected, candidates))
+    return plugin_binaries(selected, gst_profile, dependency_search_dirs(available))
 
 # Platform-specific configurations
 if sys.platform == 'win32':
@@ -163,8 +184,8 @@ if sys.platform == 'win32':
             # Add GStreamer plugins
             gst_plugins_dir = lib_path / 'gstreamer-1.0'
             if gst_plugins_dir.exists():
-                for plugin in gst_plugins_dir.glob('*.dll'):
-                    datas.append((str(plugin), 'lib/gstreamer-1.0'))
+                plugin_files = sorted(gst_plugins_dir.glob('*.dll'))
+                gst_binaries += gstreamer_binaries(plugin_files, plugin_files)
             
             break
 
@@ -250,17 +271,15 @@ else:
                 'libgstaudioparsers.so', 'libgstvpx.so', 'libgstwebp.so',
                 'libgstgtk.so', 'libgstgtk4.so', 'libgstopengl.so',
             ]
-            for plugin_name in essential_plugins:
-                plugin_path = gst_path / plugin_name
-                if plugin_path.exists():
-                    datas.append((str(plugin_path), 'lib/gstreamer-1.0'))
+            plugin_files = [gst_path / name for name in essential_plugins if (gst_path / name).exists()]
+            gst_binaries += gstreamer_binaries(plugin_files, sorted(gst_path.glob('*.so')))
             break
 
 # Analysis configuration
 a = Analysis(
     [str(SRC_DIR / '{{ NEW_NAME }}' / '__main__.py')],
     pathex=[str(SRC_DIR)],
-    binaries=[],
+    binaries=gst_binaries,
     datas=datas,
     hiddenimports=hiddenimports,
     hookspath=[str(SPEC_DIR / 'hooks')],
@@ -272,7 +291,7 @@ a = Analysis(
         'PyQt6',
         'PySide2',
         'PySide6',
-    ],
+    ] + sqlmodel_excludes,
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=None,
@@ -329,6 +348,7 @@ coll = COLLECT(
     name=APP_NAME,
 )
 
+
 # macOS App Bundle
 if sys.platform == 'darwin':
     app = BUNDLE(
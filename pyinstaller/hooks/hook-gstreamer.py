@@ -1,6 +1,7 @@
 # PyInstaller hook for GStreamer
 # Collects GStreamer libraries and plugins
 
+import importlib.util
 import os
 import sys
 from pathlib import Path
@@ -23,6 +24,18 @@ datas = []
 binaries = []
 
 
+def load_profile_module():
+    """Import pyinstaller/profile_gstreamer.py."""
+    module_path = Path(__file__).resolve().parent.parent / 'profile_gstreamer.py'
+    spec = importlib.util.spec_from_file_location('profile_gstreamer', module_path)
+    profile_gstreamer = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(profile_gstreamer)
+    return profile_gstreamer
+
+
+profile_gstreamer = load_profile_module()
+
+
 def find_gstreamer_paths():
     """Find GStreamer installation paths."""
     gst_paths = {
@@ -127,12 +140,7 @@ def collect_gstreamer_plugins(plugins_dir, plugin_categories=None):
     }
     
     # Essential plugins that should always be included
-    essential_plugins = [
-        'libgstcoreelements', 'libgstcoretracers', 'libgstplayback',
-        'libgsttypefindfunctions', 'libgstaudioconvert', 'libgstaudioresample',
-        'libgstvideoconvert', 'libgstvideoscale', 'libgstvolume',
-        'libgstautodetect', 'libgstapp', 'libgstgio',
-    ]
+    essential_plugins = profile_gstreamer.ESSENTIAL_PLUGINS
     
     # File extension based on platform
     if sys.platform == 'win32':
@@ -181,10 +189,27 @@ gst_paths = find_gstreamer_paths()
 # Set to None to collect ALL plugins, or specify categories like ['core', 'base', 'good']
 PLUGIN_CATEGORIES = ['core', 'base', 'good', 'libav']
 
+# Plugins recorded by pyinstaller/profile_gstreamer.py replace the categories,
+# unless there is no profile for this platform or PYI_GST_ALL_PLUGINS=1.
+# The essential plugins are kept either way.
 if gst_paths['plugins']:
     plugin_binaries = collect_gstreamer_plugins(gst_paths['plugins'], PLUGIN_CATEGORIES)
+    plugin_profile = profile_gstreamer.load_profile()
+    if plugin_profile is not None:
+        candidates = [src for src, _dest in plugin_binaries]
+        available = [src for src, _dest in collect_gstreamer_plugins(gst_paths['plugins'], None)]
+        selected = profile_gstreamer.select_plugins(
+            available, plugin_profile,
+            always=[profile_gstreamer.plugin_name(name) for name in profile_gstreamer.ESSENTIAL_PLUGINS])
+        missing = set(plugin_profile['plugins']) - {profile_gstreamer.plugin_name(src) for src in selected}
+        if missing:
+            logger.warning(f"Profiled GStreamer plugins not found: {', '.join(sorted(missing))}")
+        logger.info(profile_gstreamer.size_report(selected, candidates))
+        # Plugins and the libraries they need, as recorded and resolved here
+        plugin_binaries = profile_gstreamer.plugin_binaries(
+            selected, plugin_profile, profile_gstreamer.dependency_search_dirs(available))
     binaries.extend(plugin_binaries)
-    logger.info(f"Collected {len(plugin_binaries)} GStreamer plugins")
+    logger.info(f"Collected {len(plugin_binaries)} GStreamer plugins and dependencies")
 
 # Collect GStreamer typelibs
 gst_typelibs = [
@@ -1,58 +1,82 @@
 # PyInstaller hook for SQLModel
 # SQLModel depends on SQLAlchemy and Pydantic, which have their own hidden imports
+#
+# By default only the modules recorded by pyinstaller/trace_imports.py are
+# added. Without a trace, with a trace made for other package versions, or
+# with PYI_FULL_HIDDENIMPORTS=1 every submodule is collected instead.
 
-from PyInstaller.utils.hooks import collect_submodules, collect_data_files
-
-# Collect all SQLModel submodules
-hiddenimports = collect_submodules('sqlmodel')
-
-# SQLAlchemy hidden imports (database dialects and connectors)
-hiddenimports += collect_submodules('sqlalchemy')
-
-# Pydantic hidden imports
-hiddenimports += collect_submodules('pydantic')
-hiddenimports += collect_submodules('pydantic_core')
-
-# Additional commonly needed imports
-hiddenimports += [
-    'sqlalchemy.sql.default_comparator',
-    'sqlalchemy.ext.baked',
-    'sqlalchemy.dialects.sqlite',
-    'sqlalchemy.dialects.postgresql',
-    'sqlalchemy.dialects.mysql',
-    'sqlalchemy.pool',
-    'sqlalchemy.orm',
-    'sqlalchemy.orm.properties',
-    'sqlalchemy.orm.relationships',
-    'sqlalchemy.orm.session',
-    'sqlalchemy.orm.query',
-    'sqlalchemy.orm.mapper',
-    'sqlalchemy.orm.attributes',
-    'sqlalchemy.orm.instrumentation',
-    'sqlalchemy.orm.descriptor_props',
-    'sqlalchemy.orm.strategies',
-    'sqlalchemy.orm.collections',
-    'sqlalchemy.orm.dependency',
-    'sqlalchemy.orm.unitofwork',
-    'sqlalchemy.orm.identity',
-    'sqlalchemy.orm.path_registry',
-    'sqlalchemy.orm.loading',
-    'sqlalchemy.orm.persistence',
-    'sqlalchemy.orm.util',
-    'sqlalchemy.engine.default',
-    'sqlalchemy.engine.reflection',
-    'sqlalchemy.engine.interfaces',
-    'sqlalchemy.engine.mock',
-    'sqlalchemy.event',
-    'sqlalchemy.events',
-    'sqlalchemy.inspection',
-    'sqlalchemy.schema',
-    'sqlalchemy.types',
-    'sqlalchemy.util.queue',
-    'greenlet',  # Required by SQLAlchemy for async
-    'typing_extensions',
-    'annotated_types',
-]
+import importlib.util
+from pathlib import Path
+
+from PyInstaller.utils.hooks import collect_submodules, collect_data_files, logger
+
+
+def load_import_trace():
+    """Load the import trace through pyinstaller/trace_imports.py."""
+    module_path = Path(__file__).resolve().parent.parent / 'trace_imports.py'
+    spec = importlib.util.spec_from_file_location('trace_imports', module_path)
+    trace_imports = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(trace_imports)
+    return trace_imports.load_trace(warn=lambda message: logger.warning("hook-sqlmodel: %s", message))
+
+
+trace = load_import_trace()
+
+if trace is not None:
+    logger.info("hook-sqlmodel: using %d traced hidden imports", len(trace['hiddenimports']))
+    hiddenimports = list(trace['hiddenimports'])
+    excludedimports = list(trace['excludes'])
+else:
+    # Collect all SQLModel submodules
+    hiddenimports = collect_submodules('sqlmodel')
+
+    # SQLAlchemy hidden imports (database dialects and connectors)
+    hiddenimports += collect_submodules('sqlalchemy')
+
+    # Pydantic hidden imports
+    hiddenimports += collect_submodules('pydantic')
+    hiddenimports += collect_submodules('pydantic_core')
+
+    # Additional commonly needed imports
+    hiddenimports += [
+        'sqlalchemy.sql.default_comparator',
+        'sqlalchemy.ext.baked',
+        'sqlalchemy.dialects.sqlite',
+        'sqlalchemy.dialects.postgresql',
+        'sqlalchemy.dialects.mysql',
+        'sqlalchemy.pool',
+        'sqlalchemy.orm',
+        'sqlalchemy.orm.properties',
+        'sqlalchemy.orm.relationships',
+        'sqlalchemy.orm.session',
+        'sqlalchemy.orm.query',
+        'sqlalchemy.orm.mapper',
+        'sqlalchemy.orm.attributes',
+        'sqlalchemy.orm.instrumentation',
+        'sqlalchemy.orm.descriptor_props',
+        'sqlalchemy.orm.strategies',
+        'sqlalchemy.orm.collections',
+        'sqlalchemy.orm.dependency',
+        'sqlalchemy.orm.unitofwork',
+        'sqlalchemy.orm.identity',
+        'sqlalchemy.orm.path_registry',
+        'sqlalchemy.orm.loading',
+        'sqlalchemy.orm.persistence',
+        'sqlalchemy.orm.util',
+        'sqlalchemy.engine.default',
+        'sqlalchemy.engine.reflection',
+        'sqlalchemy.engine.interfaces',
+        'sqlalchemy.engine.mock',
+        'sqlalchemy.event',
+        'sqlalchemy.events',
+        'sqlalchemy.inspection',
+        'sqlalchemy.schema',
+        'sqlalchemy.types',
+        'sqlalchemy.util.queue',
+        'greenlet',  # Required by SQLAlchemy for async
+        'typing_extensions',
+        'annotated_types',
+    ]
 
 # Collect data files
 datas = collect_data_files('sqlmodel')
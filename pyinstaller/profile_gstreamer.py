@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Record which GStreamer plugins the app really loads.
+
+Representative pipelines (or the app itself) are run with plugin-loading
+debug output enabled. The plugins reported loaded by the registry and by
+the GST_PLUGIN_LOADING log, together with their shared-library
+dependencies, are written to hooks/gstreamer-plugins.json. The GStreamer
+hook and the spec file then bundle exactly those plugins instead of the
+static category lists:
+
+    python pyinstaller/profile_gstreamer.py --media song.ogg --media clip.mp4
+    python pyinstaller/profile_gstreamer.py --app --merge      # use the app, then quit it
+    python pyinstaller/profile_gstreamer.py --pipeline "videotestsrc ! gtk4paintablesink" --merge
+
+Build with PYI_GST_ALL_PLUGINS=1 to ignore the profile and use the
+category lists, as before.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = SCRIPT_DIR.parent
+SRC_DIR = PROJECT_DIR / "src"
+PROFILE_FILE = SCRIPT_DIR / "hooks" / "gstreamer-plugins.json"
+PROFILE_VERSION = 1
+
+APP_PACKAGE = "{{ NEW_NAME }}"
+
+# Exercised in every profile: the elements the app's helpers create themselves
+DEFAULT_PIPELINES = [
+    "audiotestsrc num-buffers=50 ! audioconvert ! audioresample ! volume ! autoaudiosink",
+    "videotestsrc num-buffers=30 ! videoconvert ! videoscale ! autovideosink",
+    "videotestsrc num-buffers=10 ! videoconvert ! appsink",
+    "videotestsrc num-buffers=10 ! tee name=t ! queue ! fakesink t. ! queue ! fakesink",
+]
+
+# Bundled even when a profile did not record them: playbin, typefinding,
+# tee/queue and the latency tracer are used by the app's own helpers
+ESSENTIAL_PLUGINS = [
+    'libgstcoreelements', 'libgstcoretracers', 'libgstplayback',
+    'libgsttypefindfunctions', 'libgstaudioconvert', 'libgstaudioresample',
+    'libgstvideoconvert', 'libgstvideoscale', 'libgstvolume',
+    'libgstautodetect', 'libgstapp', 'libgstgio',
+]
+
+# Seconds a pipeline may run before it is stopped
+PIPELINE_TIMEOUT = 15
+
+# Written by GStreamer when a plugin module has been loaded
+PLUGIN_LOADED_RE = re.compile(r'plugin "([^"]+)" loaded')
+
+# Libraries provided by the operating system, never bundled
+SYSTEM_LIBRARY_RE = re.compile(
+    r'^(linux-vdso|ld-linux|libc\.|libm\.|libdl\.|libpthread\.|librt\.|libresolv\.)'
+    r'|^/usr/lib/libSystem|^/System/'
+    r'|^(kernel32|user32|gdi32|advapi32|ws2_32|ole32|oleaut32|shell32|msvcrt|ntdll|bcrypt|api-ms-win-)',
+    re.IGNORECASE)
+
+
+def plugin_name(path):
+    """Plugin file name without extension, the same on every platform."""
+    return Path(path).name.split('.')[0]
+
+
+def is_system_library(path):
+    return bool(SYSTEM_LIBRARY_RE.search(Path(path).name)) or bool(SYSTEM_LIBRARY_RE.search(str(path)))
+
+
+def _run_tool(args):
+    try:
+        return subprocess.run(args, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def _direct_dependencies(path, search_dirs):
+    """Shared libraries a binary links against, as resolved paths."""
+    if sys.platform == 'darwin':
+        dependencies = []
+        for line in _run_tool(['otool', '-L', str(path)]).splitlines()[1:]:
+            name = line.strip().split(' (')[0]
+            if name.startswith('@'):
+                name = next((str(d / Path(name).name) for d in search_dirs if (d / Path(name).name).exists()), '')
+            if name and os.path.exists(name):
+                dependencies.append(name)
+        return dependencies
+
+    if sys.platform == 'win32':
+        dependencies = []
+        for name in re.findall(r'DLL Name:\s*(\S+)', _run_tool(['objdump', '-p', str(path)])):
+            found = next((d / name for d in search_dirs if (d / name).exists()), None)
+            if found:
+                dependencies.append(str(found))
+        return dependencies
+
+    # ldd already resolves the whole tree
+    return re.findall(r'=>\s*(/\S+)', _run_tool(['ldd', str(path)]))
+
+
+def resolve_dependencies(paths, search_dirs=(), cache=None):
+    """
+    Resolve the shared libraries needed by plugin files, transitively.
+
+    Args:
+        paths: Plugin file paths
+        search_dirs: Directories where @rpath libraries and DLLs are looked up
+        cache: Dict reused between calls, path -> direct dependencies
+
+    Returns:
+        dict: Plugin path -> sorted list of dependency paths
+    """
+    cache = {} if cache is None else cache
+    search_dirs = [Path(d) for d in search_dirs]
+    resolved = {}
+    for path in paths:
+        seen = set()
+        pending = [str(path)]
+        while pending:
+            current = pending.pop()
+            if current not in cache:
+                cache[current] = _direct_dependencies(current, search_dirs)
+            for dependency in cache[current]:
+                if dependency not in seen and not is_system_library(dependency):
+                    seen.add(dependency)
+                    pending.append(dependency)
+        resolved[str(path)] = sorted(seen)
+    return resolved
+
+
+def dependency_search_dirs(plugin_files):
+    """Directories where the dependencies of plugin files are looked up."""
+    search_dirs = {Path(path).parent for path in plugin_files}
+    return search_dirs | {d.parent.parent / 'bin' for d in search_dirs}
+
+
+def plugin_binaries(selected, profile_data=None, search_dirs=None, destination='lib/gstreamer-1.0'):
+    """
+    PyInstaller binaries entries for plugins and their dependencies.
+
+    Dependencies are resolved on the build machine, plus the ones the
+    profile recorded that exist here.
+
+    Args:
+        selected: Plugin paths to bundle
+        profile_data: Result of load_profile(), or None
+        search_dirs: See resolve_dependencies(), derived from selected by default
+
+    Returns:
+        list: (source, destination) tuples, plugins first
+    """
+    if search_dirs is None:
+        search_dirs = dependency_search_dirs(selected)
+    libraries = set()
+    for dependencies in resolve_dependencies(selected, search_dirs).values():
+        libraries.update(dependencies)
+    if profile_data:
+        for path in selected:
+            recorded = profile_data['plugins'].get(plugin_name(path), {})
+            libraries.update(d for d in recorded.get('dependencies', []) if os.path.isfile(d))
+    libraries -= {str(path) for path in selected}
+    return ([(str(path), destination) for path in selected] +
+            [(library, '.') for library in sorted(libraries)])
+
+
+def total_size(plugin_paths, dependencies):
+    """Bytes taken by plugin files and the union of their dependencies."""
+    files = set(plugin_paths)
+    for path in plugin_paths:
+        files.update(dependencies.get(str(path), []))
+    return sum(os.path.getsize(path) for path in files if os.path.exists(path))
+
+
+def _run_pipelines(pipelines, timeout):
+    import gi
+    gi.require_version('Gst', '1.0')
+    from gi.repository import Gst
+
+    Gst.init(None)
+    for description in pipelines:
+        try:
+            pipeline = Gst.parse_launch(description)
+        except Exception as e:
+            print(f"Warning: Could not create pipeline: {description}: {e}")
+            continue
+        pipeline.set_state(Gst.State.PLAYING)
+        message = pipeline.get_bus().timed_pop_filtered(
+            timeout * Gst.SECOND, Gst.MessageType.EOS | Gst.MessageType.ERROR)
+        if message and message.type == Gst.MessageType.ERROR:
+            error, _debug = message.parse_error()
+            print(f"Warning: {description}: {error.message}")
+        pipeline.set_state(Gst.State.NULL)
+
+
+def _dump_loaded_plugins(output):
+    loaded = []
+    gst = sys.modules.get('gi.repository.Gst')
+    if gst is not None and gst.is_initialized():
+        loaded = [plugin.get_filename() for plugin in gst.Registry.get().get_plugin_list()
+                  if plugin.is_loaded() and plugin.get_filename()]
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'pid': os.getpid(), 'loaded': loaded}, f)
+
+
+def run_child(args):
+    """Body of the profiled interpreter."""
+    import atexit
+
+    atexit.register(_dump_loaded_plugins, args.child)
+    if args.app:
+        import runpy
+        sys.argv = [APP_PACKAGE]
+        runpy.run_module(APP_PACKAGE, run_name="__main__", alter_sys=True)
+    else:
+        pipelines = list(DEFAULT_PIPELINES) + list(args.pipeline)
+        for media in args.media:
+            uri = Path(media).resolve().as_uri() if '://' not in media else media
+            sinks = " video-sink=fakesink audio-sink=fakesink" if args.fake_sinks else ""
+            pipelines.append(f"playbin uri={uri}{sinks}")
+        if args.fake_sinks:
+            pipelines = [p.replace('autoaudiosink', 'fakesink').replace('autovideosink', 'fakesink')
+                         for p in pipelines]
+        _run_pipelines(pipelines, args.timeout)
+    return 0
+
+
+def profile(args):
+    """
+    Run the profiled interpreter and collect the loaded plugin files.
+
+    Returns:
+        set: Paths of loaded plugins
+    """
+    with tempfile.TemporaryDirectory(prefix="profile-gst-") as tmp_dir:
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get('PYTHONPATH')]))
+        env['GST_DEBUG'] = ','.join(filter(None, [env.get('GST_DEBUG'), 'GST_PLUGIN_LOADING:5']))
+        # %p: one log per process, the scanner subprocess writes its own
+        env['GST_DEBUG_FILE'] = os.path.join(tmp_dir, "gst-%p.log")
+        env['GST_DEBUG_NO_COLOR'] = '1'
+        # Rescans load every plugin; keep them in the scanner subprocess
+        env.pop('GST_REGISTRY_FORK', None)
+
+        output = os.path.join(tmp_dir, "loaded.json")
+        command = [sys.executable, str(Path(__file__).resolve()), '--child', output,
+                   '--timeout', str(args.timeout)]
+        if args.app:
+            command.append('--app')
+        if args.fake_sinks:
+            command.append('--fake-sinks')
+        for pipeline in args.pipeline:
+            command += ['--pipeline', pipeline]
+        for media in args.media:
+            command += ['--media', media]
+
+        process = subprocess.run(command, env=env)
+        if process.returncode != 0 or not os.path.exists(output):
+            # An incomplete profile would drop plugins the app needs
+            raise SystemExit(f"Error: Profiled run exited with status {process.returncode}, profile not written")
+
+        with open(output, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        loaded = set(result['loaded'])
+
+        # Plugins missed by the registry still show up in the log
+        try:
+            with open(os.path.join(tmp_dir, f"gst-{result['pid']}.log"), 'r',
+                      encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    match = PLUGIN_LOADED_RE.search(line)
+                    if match:
+                        loaded.add(match.group(1))
+        except OSError:
+            pass
+    return loaded
+
+
+def build_profile(loaded, previous=None):
+    """
+    Build the profile written to PROFILE_FILE.
+
+    Args:
+        loaded: Paths of the plugins loaded by the profiled run
+        previous: Earlier profile to merge with
+    """
+    plugins = {}
+    if previous and previous.get('platform') == sys.platform:
+        plugins.update(previous.get('plugins', {}))
+
+    dependencies = resolve_dependencies(sorted(loaded), dependency_search_dirs(loaded))
+    for path in sorted(loaded):
+        plugins[plugin_name(path)] = {
+            'file': path,
+            'dependencies': dependencies[path],
+        }
+
+    return {
+        'version': PROFILE_VERSION,
+        'platform': sys.platform,
+        'plugins': dict(sorted(plugins.items())),
+    }
+
+
+def load_profile(path=PROFILE_FILE):
+    """
+    Load a profile for building.
+
+    Returns:
+        dict or None: The profile, None when it is missing, made on another
+        platform, or PYI_GST_ALL_PLUGINS is set
+    """
+    if os.environ.get('PYI_GST_ALL_PLUGINS'):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile_data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if profile_data.get('version') != PROFILE_VERSION or profile_data.get('platform') != sys.platform:
+        return None
+    return profile_data
+
+
+def select_plugins(plugin_files, profile_data, always=()):
+    """
+    Keep the plugin files named in a profile.
+
+    Args:
+        plugin_files: Candidate plugin paths
+        profile_data: Result of load_profile()
+        always: Plugin names kept even when not profiled, as plugin_name()
+
+    Returns:
+        list: Selected plugin paths
+    """
+    wanted = set(profile_data['plugins']) | set(always)
+    return [path for path in plugin_files if plugin_name(path) in wanted]
+
+
+def size_report(selected, candidates):
+    """
+    Describe the bytes saved by bundling selected instead of candidates.
+
+    Returns:
+        str: One line report
+    """
+    search_dirs = dependency_search_dirs(candidates)
+    cache = {}
+    all_paths = sorted(set(map(str, candidates)) | set(map(str, selected)))
+    dependencies = resolve_dependencies(all_paths, search_dirs, cache)
+    selected_size = total_size([str(path) for path in selected], dependencies)
+    candidates_size = total_size([str(path) for path in candidates], dependencies)
+    mib = 1024 * 1024
+    return (f"{len(selected)} of {len(candidates)} GStreamer plugins, "
+            f"{selected_size / mib:.1f} MiB instead of {candidates_size / mib:.1f} MiB "
+            f"({(candidates_size - selected_size) / mib:.1f} MiB saved, dependencies included)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--app', action='store_true',
+                        help='Run the application; play the media to profile, then quit it')
+    parser.add_argument('--media', action='append', default=[],
+                        help='Media file or URI to play with playbin (repeatable)')
+    parser.add_argument('--pipeline', action='append', default=[],
+                        help='Extra gst-launch pipeline description (repeatable)')
+    parser.add_argument('--fake-sinks', action='store_true',
+                        help='Use fakesink instead of audio/video output, for headless runs')
+    parser.add_argument('--timeout', type=int, default=PIPELINE_TIMEOUT,
+                        help='Seconds each pipeline may run')
+    parser.add_argument('--merge', action='store_true',
+                        help='Add to the existing profile instead of replacing it')
+    parser.add_argument('--output', default=str(PROFILE_FILE), help='Profile file to write')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args)
+
+    previous = None
+    if args.merge and os.path.exists(args.output):
+        with open(args.output, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    loaded = profile(args)
+    profile_data = build_profile(loaded, previous)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(profile_data, f, indent=2)
+        f.write('\n')
+
+    print(f"Recorded {len(profile_data['plugins'])} plugins: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
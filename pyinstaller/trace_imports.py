@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Record which SQLModel/SQLAlchemy/Pydantic modules the app really imports.
+
+The result, hooks/sqlmodel-imports.json, is used by hooks/hook-sqlmodel.py
+and the spec file as a minimal hidden-import list instead of collecting
+every submodule of those packages. Run it again after upgrading them or
+after the app starts using new database features:
+
+    python pyinstaller/trace_imports.py                      # built-in db scenario
+    python pyinstaller/trace_imports.py --app --merge        # use the app, then quit it
+    python pyinstaller/trace_imports.py --scenario my.py --merge
+
+Build with PYI_FULL_HIDDENIMPORTS=1 to ignore the trace and bundle
+everything, as before.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = SCRIPT_DIR.parent
+SRC_DIR = PROJECT_DIR / "src"
+TRACE_FILE = SCRIPT_DIR / "hooks" / "sqlmodel-imports.json"
+TRACE_VERSION = 1
+
+APP_PACKAGE = "{{ NEW_NAME }}"
+
+# Top-level packages whose imports are recorded (import name, distribution name)
+TRACKED_PACKAGES = {
+    'sqlmodel': 'sqlmodel',
+    'sqlalchemy': 'SQLAlchemy',
+    'pydantic': 'pydantic',
+    'pydantic_core': 'pydantic_core',
+    'greenlet': 'greenlet',
+    'typing_extensions': 'typing_extensions',
+    'annotated_types': 'annotated_types',
+}
+
+# Optional subpackages excluded from the bundle when the trace never imported them
+OPTIONAL_SUBPACKAGES = [
+    'sqlalchemy.ext.asyncio',
+    'sqlalchemy.ext.mypy',
+    'sqlalchemy.testing',
+    'pydantic.mypy',
+    'pydantic.v1',
+]
+
+# Exercises the db module the way the app does, in a throwaway data dir
+DEFAULT_SCENARIO = f'''
+from typing import Optional
+
+from gi.repository import GLib
+from sqlmodel import Field, SQLModel, select
+
+from {APP_PACKAGE} import db
+
+
+class TraceItem(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = ""
+    size: int = 0
+
+
+db.create_db_and_tables()
+db.submit(lambda session: session.add_all([TraceItem(name=str(i), size=i) for i in range(100)])).result()
+db.submit(lambda session: session.exec(select(TraceItem).where(TraceItem.size > 10)).all()).result()
+
+loop = GLib.MainLoop()
+db.stream_query(select(TraceItem), on_rows=lambda rows: None,
+                on_done=lambda count: loop.quit(), on_error=lambda error: loop.quit())
+loop.run()
+db.shutdown()
+'''
+
+# Runs in the traced interpreter, dumps sys.modules when it exits
+CHILD_CODE = '''
+import atexit, json, pkgutil, runpy, sys
+
+output, mode, target, optional = sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4].split(",")
+
+def dump():
+    modules = set(sys.modules)
+    dialects = []
+    package = sys.modules.get("sqlalchemy.dialects")
+    if package is not None:
+        dialects = ["sqlalchemy.dialects." + info.name for info in pkgutil.iter_modules(package.__path__) if info.ispkg]
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"modules": sorted(modules), "candidates": dialects + optional}, f)
+
+atexit.register(dump)
+sys.argv = [target]
+if mode == "app":
+    runpy.run_module(target, run_name="__main__", alter_sys=True)
+elif mode == "scenario":
+    runpy.run_path(target, run_name="__main__")
+else:
+    exec(compile(target, "<scenario>", "exec"), {"__name__": "__main__"})
+'''
+
+
+def installed_versions():
+    versions = {}
+    for distribution in TRACKED_PACKAGES.values():
+        try:
+            versions[distribution] = version(distribution)
+        except PackageNotFoundError:
+            pass
+    return versions
+
+
+def load_trace(path=TRACE_FILE, warn=print):
+    """
+    Load a trace for building.
+
+    Returns:
+        dict or None: The trace, None when it is missing, made for other
+        package versions, or PYI_FULL_HIDDENIMPORTS is set
+    """
+    if os.environ.get('PYI_FULL_HIDDENIMPORTS'):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            trace = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if trace.get('version') != TRACE_VERSION:
+        return None
+
+    installed = installed_versions()
+    for distribution, traced_version in trace.get('packages', {}).items():
+        if installed.get(distribution) != traced_version:
+            warn(f"{distribution} is {installed.get(distribution)} but the import trace was made "
+                 f"with {traced_version}, collecting all submodules; rerun {Path(__file__).name}")
+            return None
+    return trace
+
+
+def is_tracked(module):
+    return module.split('.')[0] in TRACKED_PACKAGES
+
+
+def run_traced(mode, target):
+    """
+    Run a scenario in a fresh interpreter and collect its imports.
+
+    Returns:
+        tuple: (imported module names, exclusion candidates)
+    """
+    with tempfile.TemporaryDirectory(prefix="trace-imports-") as tmp_dir:
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get('PYTHONPATH')]))
+        if mode != 'app':
+            # Keep the scenario away from the real user database
+            for name in ('XDG_DATA_HOME', 'XDG_CACHE_HOME', 'APPDATA', 'LOCALAPPDATA'):
+                env[name] = tmp_dir
+
+        output = os.path.join(tmp_dir, "modules.json")
+        process = subprocess.run([sys.executable, "-c", CHILD_CODE, output, mode, target,
+                                  ",".join(OPTIONAL_SUBPACKAGES)], env=env)
+        if process.returncode != 0:
+            # An incomplete trace would drop modules the app needs
+            raise SystemExit(f"Error: Traced run exited with status {process.returncode}, trace not written")
+        with open(output, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+    return set(result['modules']), set(result['candidates'])
+
+
+def build_trace(modules, candidates, previous=None):
+    """
+    Build the trace written to TRACE_FILE.
+
+    Args:
+        modules: Every module imported by the scenario
+        candidates: Optional subpackages that may be excluded
+        previous: Earlier trace to merge with
+    """
+    hiddenimports = {module for module in modules if is_tracked(module)}
+    if previous:
+        hiddenimports.update(previous.get('hiddenimports', []))
+        candidates = candidates | set(previous.get('excludes', []))
+
+    excludes = {
+        candidate for candidate in candidates
+        if not any(module == candidate or module.startswith(candidate + '.') for module in hiddenimports)
+    }
+    return {
+        'version': TRACE_VERSION,
+        'python': f"{sys.version_info.major}.{sys.version_info.minor}",
+        'packages': installed_versions(),
+        'hiddenimports': sorted(hiddenimports),
+        'excludes': sorted(excludes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--app', action='store_true',
+                       help='Run the application; use the features to record, then quit it')
+    group.add_argument('--scenario', metavar='FILE',
+                       help='Run a Python script instead of the built-in db scenario')
+    parser.add_argument('--merge', action='store_true',
+                        help='Add to the existing trace instead of replacing it')
+    parser.add_argument('--output', default=str(TRACE_FILE), help='Trace file to write')
+    args = parser.parse_args()
+
+    if args.app:
+        mode, target = 'app', APP_PACKAGE
+    elif args.scenario:
+        mode, target = 'scenario', str(Path(args.scenario).resolve())
+    else:
+        mode, target = 'code', DEFAULT_SCENARIO
+
+    previous = None
+    if args.merge and os.path.exists(args.output):
+        with open(args.output, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    modules, candidates = run_traced(mode, target)
+    trace = build_trace(modules, candidates, previous)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(trace, f, indent=2)
+        f.write('\n')
+
+    print(f"Recorded {len(trace['hiddenimports'])} hidden imports, "
+          f"{len(trace['excludes'])} excluded subpackages: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,10 +8,10 @@ gi.require_version('Adw', '1')
 
 from gi.repository import Gtk, Adw, Gio, GLib, Gdk
 from {{ NEW_NAME }}.window import MainWindow
+from {{ NEW_NAME }} import db, fonts, gstreamer, settings, startup, styles
 
 from {{ NEW_NAME }}.paths import (
     APP_ID,
-    get_resource_dir,
     get_runtime_info
 )
 
@@ -20,6 +20,9 @@ from {{ NEW_NAME }}.paths import (
 class Application(Adw.Application):
     """Main application class."""
 
+    # Load GStreamer on a worker thread once the first window has painted
+    prewarm_gstreamer = True
+
     def __init__(self):
         super().__init__(
             application_id=APP_ID,
@@ -35,11 +38,13 @@ class Application(Adw.Application):
 
     def do_startup(self):
         """Called when the application starts."""
-        Adw.Application.do_startup(self)
+        with startup.phase("Adw.Application.do_startup"):
+            Adw.Application.do_startup(self)
 
 
         # Load CSS
-        self._load_css()
+        with startup.phase("load_css"):
+            self._load_css()
 
         # Print runtime info for debugging
         print("Runtime Info:")
@@ -47,37 +52,48 @@ class Application(Adw.Application):
             print(f"  {key}: {value}")
 
 
+    def do_shutdown(self):
+        """Called when the application quits."""
+        settings.flush_all()
+        db.shutdown()
+        Adw.Application.do_shutdown(self)
+
     def _load_css(self):
         """Load application CSS."""
-        css_provider = Gtk.CssProvider()
-
-        # Try to load from GResource first
-        try:
-            css_provider.load_from_resource("{{ GIORESOURCE_ID }}/css/style.css")
-        except GLib.Error:
-            # Fallback to file
-            resource_dir = get_resource_dir()
-            css_file = resource_dir / "css" / "style.css"
-            if css_file.exists():
-                css_provider.load_from_path(str(css_file))
-                print(f"Loaded CSS from: {css_file}")
-            else:
-                print("Warning: CSS file not found")
-                return
-
-        Gtk.StyleContext.add_provider_for_display(
-            Gdk.Display.get_default(),
-            css_provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
-        )
+        self.styles = styles.StyleSheets(Gdk.Display.get_default(), self.get_style_manager())
+        self.styles.load()
 
     def do_activate(self):
         """Called when the application is activated."""
         # Get the current window or create a new one
         win = self.props.active_window
         if not win:
-            win = MainWindow(application=self)
-        win.present()
+            with startup.phase("MainWindow()"):
+                win = MainWindow(application=self)
+            if startup.is_enabled():
+                self._run_after_first_frame(win, self._on_first_frame_traced)
+            self._run_after_first_frame(win, fonts.load_deferred_fonts)
+            if self.prewarm_gstreamer:
+                self._run_after_first_frame(win, gstreamer.prewarm_gstreamer)
+        with startup.phase("present"):
+            win.present()
+
+    def _on_first_frame_traced(self):
+        startup.mark("first-frame")
+        startup.finish()
+
+    def _run_after_first_frame(self, win, callback):
+        """Run callback once, after the window has painted its first frame."""
+        def on_after_paint(frame_clock):
+            frame_clock.disconnect(paint_handler[0])
+            callback()
+
+        def on_map(widget):
+            widget.disconnect(map_handler)
+            paint_handler.append(widget.get_frame_clock().connect("after-paint", on_after_paint))
+
+        paint_handler = []
+        map_handler = win.connect("map", on_map)
 
     def create_action(self, name, callback, shortcuts=None):
         """Create a simple action."""
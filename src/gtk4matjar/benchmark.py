@@ -0,0 +1,288 @@
+"""
+Benchmarks for the GStreamer helpers.
+
+Only synthetic sources and fake sinks are used, so the suite needs no
+media files, display or audio device. Each benchmark runs in a fresh
+process, so its peak RSS is its own and not that of the ones before it:
+
+    python -m {{ NEW_NAME }}.benchmark --output before.json
+    python -m {{ NEW_NAME }}.benchmark --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+from concurrent.futures import ProcessPoolExecutor
+
+from {{ NEW_NAME }}.gstreamer import (
+    Gst,
+    SimplePlayer,
+    create_pipeline_from_string,
+    get_gst_version,
+)
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+RESULTS_VERSION = 1
+
+# Metrics compared by --compare, with True where higher is better
+COMPARED_METRICS = {
+    'fps': True,
+    'buffers_per_second': True,
+    'mean_ms': False,
+    'median_ms': False,
+}
+
+
+def get_peak_rss():
+    """Get the peak resident set size of this process in bytes, or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux and BSD report KiB
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _summarize(samples_ms):
+    return {
+        'iterations': len(samples_ms),
+        'mean_ms': statistics.mean(samples_ms),
+        'median_ms': statistics.median(samples_ms),
+        'min_ms': min(samples_ms),
+        'max_ms': max(samples_ms),
+    }
+
+
+def _run_to_eos(pipeline, timeout=60):
+    """Play pipeline until EOS and return the elapsed seconds."""
+    bus = pipeline.get_bus()
+    start = time.perf_counter()
+    pipeline.set_state(Gst.State.PLAYING)
+    message = bus.timed_pop_filtered(
+        int(timeout * Gst.SECOND),
+        Gst.MessageType.EOS | Gst.MessageType.ERROR,
+    )
+    elapsed = time.perf_counter() - start
+    pipeline.set_state(Gst.State.NULL)
+    
+    if message is None:
+        raise RuntimeError(f"Pipeline did not reach EOS within {timeout}s")
+    if message.type == Gst.MessageType.ERROR:
+        error, debug = message.parse_error()
+        raise RuntimeError(error.message)
+    return elapsed
+
+
+def bench_video_decode(frames=600, width=1920, height=1080):
+    """Frames/sec through videotestsrc ! videoconvert ! fakesink."""
+    pipeline = create_pipeline_from_string(
+        f"videotestsrc num-buffers={frames} pattern=ball "
+        f"! video/x-raw,width={width},height={height} "
+        f"! videoconvert ! fakesink sync=false"
+    )
+    elapsed = _run_to_eos(pipeline)
+    return {'frames': frames, 'seconds': elapsed, 'fps': frames / elapsed}
+
+
+def bench_appsink_pull(frames=600, width=1920, height=1080):
+    """Frames/sec pulled into Python from an appsink."""
+    pipeline = create_pipeline_from_string(
+        f"videotestsrc num-buffers={frames} "
+        f"! video/x-raw,format=RGBA,width={width},height={height} "
+        f"! appsink name=sink sync=false max-buffers=4"
+    )
+    sink = pipeline.get_by_name('sink')
+    pulled = 0
+    start = time.perf_counter()
+    pipeline.set_state(Gst.State.PLAYING)
+    while sink.emit('try-pull-sample', 5 * Gst.SECOND) is not None:
+        pulled += 1
+    elapsed = time.perf_counter() - start
+    message = pipeline.get_bus().pop_filtered(Gst.MessageType.ERROR)
+    pipeline.set_state(Gst.State.NULL)
+    
+    if message is not None:
+        error, debug = message.parse_error()
+        raise RuntimeError(error.message)
+    return {'frames': pulled, 'seconds': elapsed, 'fps': pulled / elapsed}
+
+
+def bench_audio_decode(buffers=2000):
+    """Buffers/sec through audiotestsrc ! audioconvert ! fakesink."""
+    pipeline = create_pipeline_from_string(
+        f"audiotestsrc num-buffers={buffers} samplesperbuffer=1024 "
+        f"! audioconvert ! audioresample ! fakesink sync=false"
+    )
+    elapsed = _run_to_eos(pipeline)
+    return {'buffers': buffers, 'seconds': elapsed, 'buffers_per_second': buffers / elapsed}
+
+
+def bench_time_to_playing(iterations=20):
+    """Time from set_state(PLAYING) until the state change completes."""
+    samples = []
+    for _ in range(iterations):
+        pipeline = create_pipeline_from_string(
+            "videotestsrc ! videoconvert ! fakesink sync=false "
+            "audiotestsrc ! audioconvert ! fakesink sync=false"
+        )
+        start = time.perf_counter()
+        pipeline.set_state(Gst.State.PLAYING)
+        pipeline.get_state(10 * Gst.SECOND)
+        samples.append((time.perf_counter() - start) * 1000)
+        pipeline.set_state(Gst.State.NULL)
+    return _summarize(samples)
+
+
+def _write_test_wav(path, seconds=60, rate=48000):
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(bytes(seconds * rate * 4))
+
+
+def bench_seek(iterations=20, media_seconds=60):
+    """Latency of SimplePlayer.seek() until the flushing seek has prerolled."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        media_file = os.path.join(tmp_dir, 'seek.wav')
+        _write_test_wav(media_file, media_seconds)
+        
+        player = SimplePlayer()
+        player.set_audio_sink(Gst.ElementFactory.make('fakesink', None))
+        player.set_video_sink(Gst.ElementFactory.make('fakesink', None))
+        player.preroll(media_file)
+        if player.wait(10) is None:
+            player.dispose()
+            raise RuntimeError("Could not preroll seek benchmark media")
+        
+        samples = []
+        for i in range(iterations):
+            # Deterministic spread over the whole file
+            position = (i * 7919) % (media_seconds - 1)
+            start = time.perf_counter()
+            player.seek(position)
+            player.wait(10)
+            samples.append((time.perf_counter() - start) * 1000)
+        player.dispose()
+    return _summarize(samples)
+
+
+BENCHMARKS = {
+    'video_decode': bench_video_decode,
+    'appsink_pull': bench_appsink_pull,
+    'audio_decode': bench_audio_decode,
+    'time_to_playing': bench_time_to_playing,
+    'seek': bench_seek,
+}
+
+
+def _run_benchmark(name):
+    """Run one benchmark in this process and add its peak RSS."""
+    try:
+        result = BENCHMARKS[name]()
+    except Exception as e:
+        result = {'error': str(e)}
+    result['peak_rss_bytes'] = get_peak_rss()
+    return result
+
+
+def run_isolated(name):
+    """Run one benchmark in a new spawned process, see _run_benchmark()."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        try:
+            return executor.submit(_run_benchmark, name).result()
+        except Exception as e:
+            # The worker died, e.g. GStreamer crashed
+            return {'error': f"Benchmark process failed: {e!r}", 'peak_rss_bytes': None}
+
+
+def run_benchmarks(names=None):
+    """
+    Run benchmarks, each in its own process, and collect the results.
+    
+    Args:
+        names: Benchmark names to run, or None for all
+        
+    Returns:
+        dict: JSON-serializable results
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = run_isolated(name)
+        print(f"{name}: {results[name]}", file=sys.stderr)
+    
+    peaks = [result['peak_rss_bytes'] for result in results.values()
+             if result['peak_rss_bytes'] is not None]
+    return {
+        'version': RESULTS_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'gstreamer': get_gst_version(),
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'peak_rss_bytes': max(peaks) if peaks else None,
+        'benchmarks': results,
+    }
+
+
+def compare_results(previous, current):
+    """
+    Compare two result sets.
+    
+    Returns:
+        list: (benchmark, metric, previous, current, change_percent, better) rows
+    """
+    rows = []
+    for name, result in current['benchmarks'].items():
+        old_result = previous.get('benchmarks', {}).get(name, {})
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric not in result or metric not in old_result or not old_result[metric]:
+                continue
+            old, new = old_result[metric], result[metric]
+            change = (new - old) / old * 100
+            better = change > 0 if higher_is_better else change < 0
+            rows.append((name, metric, old, new, change, better))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', '-o', help="Write JSON results to this file instead of stdout")
+    parser.add_argument('--compare', '-c', help="Previous JSON results to compare against")
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS),
+                        help="Run only this benchmark (repeatable)")
+    args = parser.parse_args(argv)
+    
+    results = run_benchmarks(args.only)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        for name, metric, old, new, change, better in compare_results(previous, results):
+            verdict = 'better' if better else 'worse'
+            print(f"{name}.{metric}: {old:.2f} -> {new:.2f} ({change:+.1f}%, {verdict})",
+                  file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""Virtualized data views for large data sets.
+
+Rows live in compact column arrays (array.array for numbers, a list for
+strings) inside an ArrayListModel; a GObject is only created for a row
+while a view holds on to it. DataView shows the model in a
+Gtk.ColumnView, which only creates and binds widgets for the visible
+rows, so the widget count stays constant however many rows there are.
+"""
+
+import weakref
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+
+import gi
+
+gi.require_version('Gtk', '4.0')
+
+from gi.repository import Gtk, Gio, GObject
+
+# Column type codes: array.array type codes, plus 'U' for strings
+STRING_COLUMN = 'U'
+
+
+class RowItem(GObject.Object):
+    """
+    Lightweight handle on one row of an ArrayListModel.
+
+    The handle follows its row when rows before it are inserted or
+    removed, so items kept by a view or a selection stay correct.
+    """
+
+    __gtype_name__ = 'DataViewRowItem'
+
+    def __init__(self, model, row_id):
+        super().__init__()
+        self.model = model
+        self.row_id = row_id
+
+    @property
+    def index(self):
+        """Current position of the row, None once it has been removed."""
+        return self.model.get_position(self.row_id)
+
+    def get(self, key):
+        """Get the value of a column for this row, None once it has been removed."""
+        index = self.index
+        if index is None:
+            return None
+        return self.model.get_value(index, key)
+
+
+class ArrayListModel(GObject.Object, Gio.ListModel):
+    """
+    Gio.ListModel backed by column arrays.
+
+    Changes made inside batch() are reported with a single items-changed
+    emission covering the changed range, instead of one per row.
+
+    Every row has a stable id; row items are cached by id, and positions
+    are looked up from ids when needed.
+    """
+
+    __gtype_name__ = 'DataViewArrayListModel'
+
+    def __init__(self, columns):
+        """
+        Args:
+            columns: Sequence of (key, type code) pairs, e.g.
+                     [("name", "U"), ("size", "q"), ("ratio", "d")]
+        """
+        super().__init__()
+        self._types = dict(columns)
+        self._columns = {key: self._new_column(key) for key in self._types}
+        self._n_items = 0
+        self._row_ids = array('q')
+        # Row ids only grow, so _row_ids stays sorted
+        self._next_row_id = 0
+        self._items = weakref.WeakValueDictionary()
+        self._batch_depth = 0
+        self._batch_start = None
+        self._batch_old_n = 0
+
+    def _new_column(self, key, values=()):
+        typecode = self._types[key]
+        if typecode == STRING_COLUMN:
+            return list(values)
+        return array(typecode, values)
+
+    # Gio.ListModel
+
+    def do_get_item_type(self):
+        return RowItem.__gtype__
+
+    def do_get_n_items(self):
+        return self._n_items
+
+    def do_get_item(self, position):
+        if position >= self._n_items:
+            return None
+        row_id = self._row_ids[position]
+        item = self._items.get(row_id)
+        if item is None:
+            item = RowItem(self, row_id)
+            self._items[row_id] = item
+        return item
+
+    # Access
+
+    @property
+    def keys(self):
+        """Column keys in order."""
+        return list(self._types)
+
+    def get_value(self, index, key):
+        """Get a single value without creating a row item."""
+        return self._columns[key][index]
+
+    def get_position(self, row_id):
+        """Get the position of a row id, None if the row was removed."""
+        index = bisect_left(self._row_ids, row_id, 0, self._n_items)
+        if index < self._n_items and self._row_ids[index] == row_id:
+            return index
+        return None
+
+    def _new_row_ids(self, count):
+        start = self._next_row_id
+        self._next_row_id += count
+        return range(start, start + count)
+
+    def get_column(self, key):
+        """Get the backing array of a column. Do not modify it directly."""
+        return self._columns[key]
+
+    # Changes
+
+    @contextmanager
+    def batch(self):
+        """Group changes into one items-changed emission."""
+        if self._batch_depth == 0:
+            self._batch_start = None
+            self._batch_old_n = self._n_items
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_start is not None:
+                start = self._batch_start
+                self._batch_start = None
+                self.items_changed(start, self._batch_old_n - start, self._n_items - start)
+
+    def _changed(self, position, removed, added):
+        if self._batch_depth:
+            if self._batch_start is None or position < self._batch_start:
+                self._batch_start = position
+        else:
+            self.items_changed(position, removed, added)
+
+    def set_columns(self, columns):
+        """
+        Replace all rows.
+
+        Args:
+            columns: Mapping of key to a sequence of values, all the same length
+        """
+        missing = [key for key in self._types if key not in columns]
+        if missing:
+            raise ValueError(f"Missing values for columns: {', '.join(missing)}")
+        lengths = {len(columns[key]) for key in self._types}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        old_n = self._n_items
+        self._columns = {key: self._new_column(key, columns[key]) for key in self._types}
+        self._n_items = lengths.pop() if lengths else 0
+        self._row_ids = array('q', self._new_row_ids(self._n_items))
+        self._items.clear()
+        self._changed(0, old_n, self._n_items)
+
+    def append_rows(self, rows):
+        """
+        Append rows.
+
+        Args:
+            rows: Iterable of tuples in column order
+        """
+        position = self._n_items
+        keys = self.keys
+        added = 0
+        for row in rows:
+            for key, value in zip(keys, row):
+                self._columns[key].append(value)
+            added += 1
+        if added:
+            self._row_ids.extend(self._new_row_ids(added))
+            self._n_items += added
+            self._changed(position, 0, added)
+
+    def update_row(self, index, **values):
+        """Update some columns of a row."""
+        for key, value in values.items():
+            self._columns[key][index] = value
+        # A view only rebinds a row when it gets a different item for it
+        self._items.pop(self._row_ids[index], None)
+        self._changed(index, 1, 1)
+
+    def remove_rows(self, position, count=1):
+        """Remove count rows starting at position."""
+        count = max(0, min(count, self._n_items - position))
+        if not count:
+            return
+        for column in self._columns.values():
+            del column[position:position + count]
+        del self._row_ids[position:position + count]
+        self._n_items -= count
+        self._changed(position, count, 0)
+
+    def clear(self):
+        """Remove all rows."""
+        self.remove_rows(0, self._n_items)
+
+
+class DataView(Gtk.ScrolledWindow):
+    """Scrollable, virtualized table showing an ArrayListModel."""
+
+    __gtype_name__ = 'DataView'
+
+    def __init__(self, model, selection_mode=Gtk.SelectionMode.SINGLE, **kwargs):
+        super().__init__(**kwargs)
+        self.model = model
+        self.set_vexpand(True)
+
+        if selection_mode == Gtk.SelectionMode.MULTIPLE:
+            self.selection = Gtk.MultiSelection.new(model)
+        elif selection_mode == Gtk.SelectionMode.NONE:
+            self.selection = Gtk.NoSelection.new(model)
+        else:
+            self.selection = Gtk.SingleSelection.new(model)
+
+        self.column_view = Gtk.ColumnView.new(self.selection)
+        self.column_view.add_css_class("data-table")
+        self.set_child(self.column_view)
+
+    def add_column(self, title, key, formatter=str, expand=False, xalign=0.0):
+        """
+        Add a text column.
+
+        Args:
+            title: Column header
+            key: Model column key
+            formatter: Callable turning a value into the displayed text
+            expand: Whether the column takes the remaining width
+            xalign: Horizontal alignment of the cell text
+
+        Returns:
+            Gtk.ColumnViewColumn: The added column
+        """
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_setup, xalign)
+        factory.connect("bind", self._on_bind, key, formatter)
+        factory.connect("unbind", self._on_unbind)
+
+        column = Gtk.ColumnViewColumn.new(title, factory)
+        column.set_expand(expand)
+        column.set_resizable(True)
+        self.column_view.append_column(column)
+        return column
+
+    def _on_setup(self, factory, list_item, xalign):
+        label = Gtk.Label()
+        label.set_xalign(xalign)
+        list_item.set_child(label)
+
+    def _on_bind(self, factory, list_item, key, formatter):
+        item = list_item.get_item()
+        index = item.index
+        list_item.get_child().set_text("" if index is None else formatter(self.model.get_value(index, key)))
+
+    def _on_unbind(self, factory, list_item):
+        list_item.get_child().set_text("")
@@ -0,0 +1,278 @@
+"""SQLite data layer built on SQLModel.
+
+The engine keeps its database in the user data dir, in WAL mode, with a
+small connection pool shared by a thread pool that runs every query off
+the GTK main loop. Results come back on the main loop through
+GLib.idle_add, large results in batches, so a long query never blocks
+the UI.
+
+SQLModel is only imported on first use, so apps that do not touch the
+database pay nothing at startup.
+"""
+
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from gi.repository import GLib
+
+from {{ NEW_NAME }}.paths import APP_NAME, get_portable_data_dir, get_user_data_dir
+
+DATABASE_FILE = f"{APP_NAME}.db"
+
+# One pooled connection per worker thread
+MAX_WORKERS = 4
+
+# Rows handed to the main loop per idle callback
+RESULT_BATCH_SIZE = 500
+
+# Batches queued on the main loop before the worker waits for them to be consumed
+MAX_PENDING_BATCHES = 2
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+    'busy_timeout': 5000,
+    'cache_size': -16000,        # KiB
+    'temp_store': 'MEMORY',
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+_engine = None
+_executor = None
+_db_lock = threading.Lock()
+_streams = weakref.WeakSet()
+
+
+def get_database_path():
+    """Get the path of the SQLite database file."""
+    data_dir = get_portable_data_dir() or get_user_data_dir()
+    return data_dir / DATABASE_FILE
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def get_engine(echo=False):
+    """
+    Get the shared engine, creating it on first use.
+
+    Args:
+        echo: Log emitted SQL (only honoured when the engine is created)
+
+    Returns:
+        sqlalchemy.engine.Engine
+    """
+    global _engine
+
+    with _db_lock:
+        if _engine is None:
+            from sqlalchemy import event
+            from sqlalchemy.pool import QueuePool
+            from sqlmodel import create_engine
+
+            path = get_database_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            engine = create_engine(
+                f"sqlite:///{path}",
+                echo=echo,
+                connect_args={'check_same_thread': False, 'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000},
+                poolclass=QueuePool,
+                pool_size=MAX_WORKERS,
+                max_overflow=0,
+                pool_timeout=30,
+            )
+            event.listen(engine, 'connect', _apply_pragmas)
+            _engine = engine
+        return _engine
+
+
+def create_db_and_tables():
+    """Create the tables of every imported SQLModel table model."""
+    from sqlmodel import SQLModel
+
+    SQLModel.metadata.create_all(get_engine())
+
+
+def get_executor():
+    """Get the thread pool that runs database work."""
+    global _executor
+
+    with _db_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='db')
+        return _executor
+
+
+def _new_session():
+    from sqlmodel import Session
+
+    # Objects are handed to the main thread after the session closes
+    return Session(get_engine(), expire_on_commit=False)
+
+
+def submit(func, *args, **kwargs):
+    """
+    Run func(session, *args, **kwargs) on a database worker thread.
+
+    The session is committed when func returns and rolled back if it raises.
+
+    Returns:
+        concurrent.futures.Future: Resolves to the return value of func
+    """
+    def worker():
+        with _new_session() as session:
+            try:
+                result = func(session, *args, **kwargs)
+                session.commit()
+            except BaseException:
+                session.rollback()
+                raise
+            return result
+
+    return get_executor().submit(worker)
+
+
+def run_query(func, *args, on_done=None, on_error=None, **kwargs):
+    """
+    Run func(session, *args, **kwargs) off the main loop.
+
+    Args:
+        func: Callable doing the database work
+        on_done: Called on the main loop with the result
+        on_error: Called on the main loop with the exception,
+                  a warning is printed when omitted
+
+    Returns:
+        concurrent.futures.Future: Resolves to the return value of func
+    """
+    def dispatch(future):
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"Warning: Database query failed: {error}")
+        elif on_done:
+            on_done(future.result())
+        return GLib.SOURCE_REMOVE
+
+    future = submit(func, *args, **kwargs)
+    future.add_done_callback(lambda future: GLib.idle_add(dispatch, future))
+    return future
+
+
+class QueryStream:
+    """
+    Rows of one query delivered to the main loop in batches.
+
+    The worker never runs more than MAX_PENDING_BATCHES ahead of the main
+    loop, so a huge result does not pile up in memory or starve the UI.
+    """
+
+    def __init__(self, statement, on_rows, on_done=None, on_error=None,
+                 batch_size=RESULT_BATCH_SIZE, scalars=True):
+        self.statement = statement
+        self.on_rows = on_rows
+        self.on_done = on_done
+        self.on_error = on_error
+        self.batch_size = batch_size
+        self.scalars = scalars
+        self.row_count = 0
+        self._cancelled = threading.Event()
+        self._slots = threading.Semaphore(MAX_PENDING_BATCHES)
+        _streams.add(self)
+        self.future = get_executor().submit(self._worker)
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop fetching; batches already queued are dropped."""
+        self._cancelled.set()
+        # Wake a worker waiting for the main loop
+        self._slots.release()
+
+    def _worker(self):
+        try:
+            with _new_session() as session:
+                result = session.execute(
+                    self.statement.execution_options(yield_per=self.batch_size))
+                if self.scalars:
+                    result = result.scalars()
+                for rows in result.partitions(self.batch_size):
+                    self._slots.acquire()
+                    if self.cancelled:
+                        result.close()
+                        return
+                    GLib.idle_add(self._deliver, rows)
+        except Exception as e:
+            GLib.idle_add(self._fail, e)
+            return
+        GLib.idle_add(self._finish)
+
+    def _deliver(self, rows):
+        self._slots.release()
+        if not self.cancelled:
+            self.row_count += len(rows)
+            self.on_rows(rows)
+        return GLib.SOURCE_REMOVE
+
+    def _finish(self):
+        if not self.cancelled and self.on_done:
+            self.on_done(self.row_count)
+        return GLib.SOURCE_REMOVE
+
+    def _fail(self, error):
+        if not self.cancelled:
+            if self.on_error:
+                self.on_error(error)
+            else:
+                print(f"Warning: Database query failed: {error}")
+        return GLib.SOURCE_REMOVE
+
+
+def stream_query(statement, on_rows, on_done=None, on_error=None,
+                 batch_size=RESULT_BATCH_SIZE, scalars=True):
+    """
+    Run a select off the main loop and receive its rows in batches.
+
+    Args:
+        statement: SQLModel/SQLAlchemy select()
+        on_rows: Called on the main loop with each list of rows
+        on_done: Called on the main loop with the row count when finished
+        on_error: Called on the main loop with the exception
+        batch_size: Rows per batch
+        scalars: Deliver model objects instead of row tuples
+
+    Returns:
+        QueryStream: Handle that can cancel the query
+    """
+    return QueryStream(statement, on_rows, on_done, on_error, batch_size, scalars)
+
+
+def shutdown():
+    """Wait for running queries and close every pooled connection."""
+    global _engine, _executor
+
+    with _db_lock:
+        executor, _executor = _executor, None
+        engine, _engine = _engine, None
+
+    # Streams waiting on the main loop would never finish otherwise
+    for stream in list(_streams):
+        stream.cancel()
+
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+    if engine is not None:
+        engine.dispose()
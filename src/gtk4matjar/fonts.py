@@ -0,0 +1,272 @@
+"""Custom font registration for bundled fonts.
+
+Fonts shipped in share/fonts are registered with the default PangoCairo
+font map. Only fonts needed for the active languages are registered
+before the UI starts; the rest are registered from idle callbacks once
+the window is shown. Font headers are probed once, in parallel, and the
+results cached by mtime and size in the user cache dir.
+"""
+
+import json
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from {{ NEW_NAME }}.paths import get_user_cache_dir
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.otc')
+FONT_CACHE_FILE = 'fonts.json'
+FONT_CACHE_VERSION = 1
+
+# Seconds of main loop time spent registering deferred fonts per idle callback
+DEFERRED_TIME_BUDGET = 0.008
+
+# OS/2 ulUnicodeRange bits identifying scripts
+SCRIPT_RANGES = {
+    'latin': (0, 1, 2, 3),
+    'greek': (7,),
+    'cyrillic': (9,),
+    'armenian': (10,),
+    'hebrew': (11,),
+    'arabic': (13, 63, 67),
+    'devanagari': (15,),
+    'bengali': (16,),
+    'thai': (24,),
+    'georgian': (26,),
+    'hangul': (28, 56),
+    'kana': (49, 50),
+    'cjk': (59,),
+    'ethiopic': (75,),
+}
+
+# Scripts whose fonts are large enough to only register when needed
+HEAVY_SCRIPTS = {'cjk', 'hangul', 'kana'}
+
+# Scripts needed by a language, anything missing here is Latin
+LANGUAGE_SCRIPTS = {
+    'ar': ('arabic',), 'fa': ('arabic',), 'ur': ('arabic',), 'ps': ('arabic',),
+    'ckb': ('arabic',), 'ug': ('arabic',),
+    'he': ('hebrew',), 'yi': ('hebrew',),
+    'ru': ('cyrillic',), 'uk': ('cyrillic',), 'be': ('cyrillic',), 'bg': ('cyrillic',),
+    'sr': ('cyrillic',), 'mk': ('cyrillic',), 'kk': ('cyrillic',), 'ky': ('cyrillic',),
+    'mn': ('cyrillic',), 'tg': ('cyrillic',),
+    'el': ('greek',),
+    'hy': ('armenian',),
+    'ka': ('georgian',),
+    'hi': ('devanagari',), 'mr': ('devanagari',), 'ne': ('devanagari',),
+    'bn': ('bengali',),
+    'th': ('thai',),
+    'am': ('ethiopic',),
+    'zh': ('cjk',),
+    'ja': ('cjk', 'kana'),
+    'ko': ('hangul', 'cjk'),
+}
+
+_deferred_fonts = []
+# (cache file, font entries) kept to record fonts failing in the deferred phase
+_cache_state = None
+
+
+def _probe_font(path):
+    """
+    Check that path is an sfnt font and read the scripts it covers.
+    
+    Returns:
+        list of script names, [] if the font has no OS/2 table,
+        or None if the file is not a usable font
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(12)
+            if len(header) < 12:
+                return None
+            offset = 0
+            if header[:4] == b'ttcf':
+                # Font collection: inspect the first face
+                offset = struct.unpack('>I', f.read(4))[0]
+                f.seek(offset)
+                header = f.read(12)
+            if header[:4] not in (b'\x00\x01\x00\x00', b'OTTO', b'true'):
+                return None
+            
+            num_tables = struct.unpack('>H', header[4:6])[0]
+            directory = f.read(num_tables * 16)
+            for i in range(num_tables):
+                tag, _, table_offset, length = struct.unpack('>4sIII', directory[i * 16:i * 16 + 16])
+                if tag != b'OS/2':
+                    continue
+                if length < 58:
+                    return []
+                f.seek(table_offset + 42)
+                ranges = struct.unpack('>IIII', f.read(16))
+                bits = ranges[0] | ranges[1] << 32 | ranges[2] << 64 | ranges[3] << 96
+                return [script for script, script_bits in SCRIPT_RANGES.items()
+                        if any(bits >> bit & 1 for bit in script_bits)]
+            return []
+    except (OSError, struct.error):
+        return None
+
+
+def _load_cache(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != FONT_CACHE_VERSION:
+        return {}
+    return data.get('fonts', {})
+
+
+def _save_cache(path, fonts):
+    tmp_path = f'{path}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': FONT_CACHE_VERSION, 'fonts': fonts}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not write font cache: {e}")
+
+
+def scripts_for_languages(languages):
+    """Get the set of scripts needed to display the given language codes."""
+    scripts = {'latin'}
+    for language in languages or ():
+        code = language.split('.')[0].split('@')[0].split('_')[0].lower()
+        scripts.update(LANGUAGE_SCRIPTS.get(code, ()))
+    return scripts
+
+
+def _needed_up_front(scripts, wanted):
+    if not scripts:
+        # Unknown coverage, do not risk missing glyphs
+        return True
+    scripts = set(scripts)
+    if scripts & (wanted - {'latin'}):
+        return True
+    if scripts & HEAVY_SCRIPTS:
+        # CJK families are large and only useful for their own locales
+        return False
+    # Latin UI fonts are needed everywhere, other-script-only fonts are not
+    return 'latin' in scripts
+
+
+def _register(font_map, path, entry):
+    try:
+        font_map.add_font_file(path)
+    except Exception as e:
+        print(f"Error loading {os.path.basename(path)}: {e}")
+        entry['valid'] = False
+        return False
+    return True
+
+
+def load_custom_fonts(fonts_dir, languages=None):
+    """
+    Register fonts in fonts_dir needed for languages.
+    
+    Fonts for other scripts are remembered and registered later by
+    load_deferred_fonts().
+    
+    Args:
+        fonts_dir: Directory containing bundled font files
+        languages: Language codes in preference order (e.g. ['ar_SY', 'ar'])
+        
+    Returns:
+        int: Number of fonts registered now
+    """
+    if not os.path.isdir(fonts_dir):
+        return 0
+    
+    import gi
+    gi.require_version('PangoCairo', '1.0')
+    from gi.repository import PangoCairo
+    
+    cache_file = str(get_user_cache_dir() / FONT_CACHE_FILE)
+    cache = _load_cache(cache_file)
+    fonts = {}
+    to_probe = []
+    
+    with os.scandir(fonts_dir) as entries:
+        for dir_entry in entries:
+            if not dir_entry.name.lower().endswith(FONT_EXTENSIONS) or not dir_entry.is_file():
+                continue
+            stat = dir_entry.stat()
+            entry = cache.get(dir_entry.name)
+            if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+                to_probe.append((dir_entry.name, dir_entry.path))
+            fonts[dir_entry.name] = entry
+    
+    if to_probe:
+        # Parsing headers is I/O bound, so threads overlap the reads
+        with ThreadPoolExecutor(max_workers=min(8, len(to_probe))) as executor:
+            results = executor.map(_probe_font, [path for _, path in to_probe])
+            for (name, _), scripts in zip(to_probe, results):
+                fonts[name]['valid'] = scripts is not None
+                fonts[name]['scripts'] = scripts or []
+    
+    font_map = PangoCairo.FontMap.get_default()
+    wanted = scripts_for_languages(languages)
+    loaded = 0
+    failed = 0
+    start = time.perf_counter()
+    
+    for name in sorted(fonts):
+        entry = fonts[name]
+        if not entry['valid']:
+            continue
+        path = os.path.join(fonts_dir, name)
+        if _needed_up_front(entry['scripts'], wanted):
+            if _register(font_map, path, entry):
+                loaded += 1
+            else:
+                failed += 1
+        else:
+            _deferred_fonts.append((path, entry))
+    
+    # Invalid fonts are cached like valid ones, so only new results are written
+    if to_probe or failed or fonts.keys() != cache.keys():
+        _save_cache(cache_file, fonts)
+    
+    global _cache_state
+    _cache_state = (cache_file, fonts)
+    
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Loaded {loaded} fonts in {elapsed:.1f} ms ({len(_deferred_fonts)} deferred)")
+    return loaded
+
+
+def load_deferred_fonts():
+    """
+    Register the fonts skipped by load_custom_fonts() from idle callbacks.
+    
+    Each callback spends at most DEFERRED_TIME_BUDGET seconds so frames
+    keep being drawn while fonts load.
+    """
+    if not _deferred_fonts:
+        return
+    
+    import gi
+    gi.require_version('PangoCairo', '1.0')
+    from gi.repository import GLib, PangoCairo
+    
+    font_map = PangoCairo.FontMap.get_default()
+    
+    failed = []
+    
+    def register_chunk():
+        deadline = time.perf_counter() + DEFERRED_TIME_BUDGET
+        while _deferred_fonts:
+            path, entry = _deferred_fonts.pop(0)
+            if not _register(font_map, path, entry):
+                failed.append(path)
+            if time.perf_counter() >= deadline:
+                return GLib.SOURCE_CONTINUE
+        if failed and _cache_state is not None:
+            _save_cache(*_cache_state)
+        return GLib.SOURCE_REMOVE
+    
+    GLib.idle_add(register_chunk, priority=GLib.PRIORITY_LOW)
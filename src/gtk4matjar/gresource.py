@@ -0,0 +1,233 @@
+"""GResource bundle building and loading.
+
+In a source checkout the bundle is compiled from the .gresource.xml into
+the user cache dir, named by a hash of its inputs, so a stale bundle is
+never loaded and an unchanged one is never recompiled. An mtime/size
+stamp of the inputs skips the hashing on launches where nothing was
+touched. Installed and frozen builds load their prebuilt bundle.
+
+Bundles are memory-mapped and handed to Gio without copying.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import xml.etree.ElementTree as ET
+
+from {{ NEW_NAME }}.paths import get_resource_dir, get_user_cache_dir, is_frozen, is_flatpak
+
+RESOURCE_NAME = '{{ NEW_NAME }}'
+RESOURCE_CACHE_DIR = 'gresource'
+RESOURCE_STAMP_FILE = 'stamp.json'
+RESOURCE_CACHE_VERSION = 1
+
+# Kept alive for the lifetime of the process, Gio does not copy the data
+_loaded = []
+
+
+def get_resource_xml():
+    """Get the path of the resource description file."""
+    return get_resource_dir() / f"{RESOURCE_NAME}.gresource.xml"
+
+
+def get_prebuilt_bundle():
+    """Get the path of the bundle shipped next to the resource description."""
+    return get_resource_dir() / f"{RESOURCE_NAME}.gresource"
+
+
+def get_resource_inputs(xml_path):
+    """
+    List the files a resource description depends on.
+
+    Args:
+        xml_path: Path to the .gresource.xml file
+
+    Returns:
+        list: (path, preprocess) tuples, the description itself first
+    """
+    source_dir = xml_path.parent
+    inputs = [(xml_path, '')]
+    for element in ET.parse(xml_path).getroot().iter('file'):
+        inputs.append((source_dir / element.text.strip(), element.get('preprocess', '')))
+    return inputs
+
+
+def _stamp(inputs):
+    stamp = []
+    for path, _preprocess in inputs:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stamp.append([str(path), stat.st_mtime_ns, stat.st_size])
+    return stamp
+
+
+def hash_resource_inputs(inputs):
+    """
+    Hash the contents of the resource inputs.
+
+    Args:
+        inputs: Result of get_resource_inputs()
+
+    Returns:
+        str: Hex digest identifying the compiled bundle
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{RESOURCE_CACHE_VERSION}".encode())
+    for path, preprocess in inputs:
+        digest.update(f"\0{path.name}\0{preprocess}\0".encode())
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def _load_stamp(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != RESOURCE_CACHE_VERSION:
+        return {}
+    return data
+
+
+def _save_stamp(path, stamp, digest):
+    tmp_path = f'{path}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': RESOURCE_CACHE_VERSION, 'stamp': stamp, 'hash': digest}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not write resource stamp: {e}")
+
+
+def compile_resources(xml_path, target):
+    """
+    Compile a resource description with glib-compile-resources.
+
+    The bundle is written next to the target and renamed into place,
+    so a concurrent launch never maps a half-written file.
+
+    Args:
+        xml_path: Path to the .gresource.xml file
+        target: Path of the bundle to write
+    """
+    tmp_target = f'{target}.{os.getpid()}.tmp'
+    try:
+        subprocess.run([
+            "glib-compile-resources",
+            "--sourcedir", str(xml_path.parent),
+            "--target", tmp_target,
+            str(xml_path)
+        ], check=True, capture_output=True)
+        os.replace(tmp_target, target)
+    finally:
+        if os.path.exists(tmp_target):
+            os.remove(tmp_target)
+
+
+def ensure_compiled(xml_path, cache_dir=None):
+    """
+    Get an up to date compiled bundle for a resource description.
+
+    Args:
+        xml_path: Path to the .gresource.xml file
+        cache_dir: Directory holding compiled bundles, defaults to the user cache dir
+
+    Returns:
+        Path: Compiled bundle, named by the hash of its inputs
+    """
+    cache_dir = cache_dir or get_user_cache_dir() / RESOURCE_CACHE_DIR
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    stamp_file = cache_dir / RESOURCE_STAMP_FILE
+
+    inputs = get_resource_inputs(xml_path)
+    stamp = _stamp(inputs)
+    cached = _load_stamp(stamp_file)
+
+    # Fast path: no input touched since the last build
+    if stamp is not None and cached.get('stamp') == stamp:
+        bundle = cache_dir / f"{cached['hash']}.gresource"
+        if bundle.exists():
+            return bundle
+
+    digest = hash_resource_inputs(inputs)
+    bundle = cache_dir / f"{digest}.gresource"
+    if not bundle.exists():
+        print(f"Compiling resources: {xml_path}")
+        compile_resources(xml_path, bundle)
+        for old_bundle in cache_dir.glob("*.gresource"):
+            if old_bundle != bundle:
+                try:
+                    old_bundle.unlink()
+                except OSError:
+                    pass
+
+    _save_stamp(stamp_file, stamp, digest)
+    return bundle
+
+
+def load_bundle(path):
+    """
+    Map a compiled bundle into memory and register it.
+
+    Args:
+        path: Path to a .gresource file
+
+    Returns:
+        Gio.Resource: The registered resource
+    """
+    from gi.repository import GLib, Gio
+
+    mapped = GLib.MappedFile.new(str(path), False)
+    resource = Gio.Resource.new_from_data(mapped.get_bytes())
+    resource._register()
+    _loaded.append((mapped, resource))
+    return resource
+
+
+def find_bundle():
+    """
+    Decide which bundle to load for this run.
+
+    Returns:
+        Path or None: Bundle path, None if no bundle is available
+    """
+    xml_path = get_resource_xml()
+    prebuilt = get_prebuilt_bundle()
+
+    if not (is_frozen() or is_flatpak()) and xml_path.exists():
+        if shutil.which("glib-compile-resources"):
+            try:
+                return ensure_compiled(xml_path)
+            except (OSError, ET.ParseError, subprocess.CalledProcessError) as e:
+                stderr = getattr(e, 'stderr', None)
+                print(f"Warning: Could not compile resources: {stderr.decode().strip() if stderr else e}")
+        elif not prebuilt.exists():
+            print("Warning: glib-compile-resources not found, install the glib tools to compile resources")
+
+    if prebuilt.exists():
+        return prebuilt
+    return None
+
+
+def load_resources():
+    """
+    Load the application resources.
+
+    Returns:
+        Gio.Resource or None: The registered resource
+    """
+    bundle = find_bundle()
+    if bundle is None:
+        print(f"Warning: Resource file not found: {get_prebuilt_bundle()}")
+        return None
+
+    resource = load_bundle(bundle)
+    print(f"Loaded resources from: {bundle}")
+    return resource
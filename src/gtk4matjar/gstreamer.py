@@ -1,45 +1,299 @@
-"""GStreamer utilities for the application."""
+"""GStreamer utilities for the application.
 
+The Gst typelib is not imported when this module is imported. ``Gst`` below
+is a lazy stand-in that imports the typelib and runs ``Gst.init`` on first
+attribute access, so importing this module costs nothing at startup.
+Use prewarm_gstreamer() to pay that cost on a worker thread instead.
+"""
+
+import hashlib
+import importlib
+import json
 import os
+import shutil
 import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import gi
+from gi.repository import GLib, GObject
+
+from {{ NEW_NAME }}.paths import is_frozen, get_base_dir, get_user_cache_dir
+
+# Bump when the on-disk layout of the capability cache changes
+CAPABILITY_CACHE_VERSION = 2
+CAPABILITY_CACHE_FILE = 'gst-capabilities.json'
+
+# Part of the plugin set hash, bump to regenerate every cached registry
+REGISTRY_CACHE_VERSION = 1
+
+# Categories reported by get_supported_formats(), first match wins
+FORMAT_CATEGORIES = (
+    ('audio_decoders', 'Decoder/Audio'),
+    ('video_decoders', 'Decoder/Video'),
+    ('audio_encoders', 'Encoder/Audio'),
+    ('video_encoders', 'Encoder/Video'),
+    ('demuxers', 'Demuxer'),
+    ('muxers', 'Muxer'),
+)
+
+# Guards GStreamer loading and the module level caches below
+_gst_lock = threading.RLock()
+_gst_module = None
+_prewarm_future = None
+
+_capability_index = None
+_capability_cookie = None
+
+# Registry being regenerated by this process, if any
+_registry_rebuild = None
+_environment_configured = False
+
+# Bytes read ahead from queued local files where posix_fadvise is unavailable
+PREFETCH_HEAD_BYTES = 256 * 1024
+
+# Single worker shared by every QueuePlayer, created on first prefetch
+_prefetch_executor = None
+
+# PipelineMetrics instances receiving latency tracer records
+_metrics_collectors = weakref.WeakSet()
+_latency_tracing = False
+_tracer_owns_debug_output = False
+
+
+def compute_plugin_set_hash(plugin_dir):
+    """
+    Hash the plugin set of a directory from file names and sizes.
+    
+    One directory listing, no plugin is opened, so this is cheap enough
+    to run on every launch.
+    """
+    digest = hashlib.sha256(f"{REGISTRY_CACHE_VERSION}".encode())
+    with os.scandir(plugin_dir) as entries:
+        plugins = sorted((entry.name, entry.stat().st_size) for entry in entries if entry.is_file())
+    for name, size in plugins:
+        digest.update(f"{name}\0{size}\0".encode())
+    return digest.hexdigest()[:32]
+
+
+def _is_onefile(base_dir):
+    """Whether the bundle is unpacked to a new temporary directory on every launch."""
+    return base_dir.name.startswith('_MEI')
+
+
+def _stable_plugin_dir(plugin_dir, plugin_hash):
+    """
+    Copy the plugins of a onefile bundle where they outlive the launch.
+    
+    A registry records absolute plugin paths, so one made for the
+    temporary directory would be stale at the next launch. The copy is
+    made once per plugin set.
+    
+    Returns:
+        Path: Directory to load the plugins from
+    """
+    cache_dir = get_user_cache_dir() / 'gst-plugins'
+    target = cache_dir / plugin_hash
+    if not target.exists():
+        tmp_dir = cache_dir / f'{plugin_hash}.tmp-{os.getpid()}'
+        try:
+            shutil.copytree(plugin_dir, tmp_dir)
+            os.replace(tmp_dir, target)
+        except OSError as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not target.exists():
+                print(f"Warning: Could not copy GStreamer plugins to {target}: {e}")
+                return plugin_dir
+    
+    # Plugins of earlier versions of the app; copies in progress are left alone
+    for path in cache_dir.iterdir():
+        if path != target and '.tmp-' not in path.name:
+            shutil.rmtree(path, ignore_errors=True)
+    return target
+
+
+def _select_registry(plugin_dir, plugin_hash):
+    """
+    Pick the registry file for a frozen build.
+    
+    Registries store absolute plugin paths, and GStreamer rescans a
+    plugin whose path changed, so none is shipped with the bundle. The
+    registry lives in the user cache, one per plugin set and plugin
+    directory, so it is built once per install location and not on
+    every launch.
+    
+    Returns:
+        tuple: (registry path, True if it already exists)
+    """
+    cached = get_user_cache_dir() / 'gst-registry' / f'{plugin_hash}-{_registry_location(plugin_dir)}.bin'
+    return cached, cached.exists()
+
+
+def _registry_location(plugin_dir):
+    return hashlib.sha256(str(plugin_dir).encode()).hexdigest()[:12]
+
+
+def _remove_stale_registries(registry):
+    """Remove registries of older plugin sets at the same location, keep other installs."""
+    location = registry.stem.rsplit('-', 1)[-1]
+    for path in registry.parent.glob(f'*-{location}.bin'):
+        if path != registry:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _configure_environment():
+    """
+    Set plugin and registry paths for PyInstaller builds before Gst.init runs.
+    
+    Writes os.environ, which is not safe while other threads read the
+    environment, so call it from the main thread; only the first call
+    does anything.
+    """
+    global _registry_rebuild, _environment_configured
+    
+    with _gst_lock:
+        if _environment_configured:
+            return
+        _environment_configured = True
+        
+        if is_frozen():
+            base_dir = get_base_dir()
+            plugin_path = base_dir / 'lib' / 'gstreamer-1.0'
+            
+            if plugin_path.exists():
+                plugin_hash = compute_plugin_set_hash(plugin_path)
+                if _is_onefile(base_dir):
+                    plugin_path = _stable_plugin_dir(plugin_path, plugin_hash)
+                
+                os.environ['GST_PLUGIN_PATH'] = str(plugin_path)
+                os.environ['GST_PLUGIN_SYSTEM_PATH'] = str(plugin_path)
+                
+                # Disable plugin scanner for frozen apps (already scanned)
+                os.environ['GST_PLUGIN_SCANNER'] = ''
+                
+                registry, valid = _select_registry(plugin_path, plugin_hash)
+                os.environ['GST_REGISTRY'] = str(registry)
+                if valid:
+                    os.environ['GST_REGISTRY_UPDATE'] = 'no'
+                else:
+                    # Scan once, in process: Gst.init runs on the pre-warm thread
+                    print(f"GStreamer registry out of date, regenerating: {registry}")
+                    registry.parent.mkdir(parents=True, exist_ok=True)
+                    os.environ.pop('GST_REGISTRY_UPDATE', None)
+                    os.environ['GST_REGISTRY_FORK'] = 'no'
+                    _registry_rebuild = registry
+
+
+def _load_gst():
+    """Import the Gst typelib and initialize GStreamer, once."""
+    global _gst_module
+    if _gst_module is not None:
+        return _gst_module
+    
+    with _gst_lock:
+        if _gst_module is None:
+            _configure_environment()
+            gi.require_version('Gst', '1.0')
+            from gi.repository import Gst as gst_module
+            gst_module.init(None)
+            _gst_module = gst_module
+            if _registry_rebuild is not None:
+                _remove_stale_registries(_registry_rebuild)
+    return _gst_module
+
+
+def _load_gst_module(name):
+    """Import an additional GStreamer typelib such as GstApp or GstVideo."""
+    _load_gst()
+    gi.require_version(name, '1.0')
+    return importlib.import_module(f'gi.repository.{name}')
+
+
+class _LazyGst:
+    """Proxy for gi.repository.Gst that loads GStreamer on first attribute access."""
+    
+    def __getattr__(self, name):
+        value = getattr(_load_gst(), name)
+        # Cache on the instance so later lookups bypass __getattr__
+        setattr(self, name, value)
+        return value
+    
+    def __repr__(self):
+        state = 'loaded' if _gst_module is not None else 'not loaded'
+        return f"<lazy gi.repository.Gst ({state})>"
 
-gi.require_version('Gst', '1.0')
-from gi.repository import Gst, GLib
 
-from {{ NEW_NAME }}.paths import is_frozen, get_base_dir
+Gst = _LazyGst()
 
 
 def init_gstreamer():
     """
     Initialize GStreamer with proper plugin paths.
-    Call this before using any GStreamer functionality.
+    
+    Calling this is optional: GStreamer is initialized on first use of
+    any helper in this module. Call it to control when the cost is paid.
+    """
+    _load_gst()
+
+
+def is_gstreamer_loaded():
+    """Check if the Gst typelib has been imported and initialized."""
+    return _gst_module is not None
+
+
+def prewarm_gstreamer():
     """
-    # Set plugin path for PyInstaller builds
-    if is_frozen():
-        base_dir = get_base_dir()
-        plugin_path = base_dir / 'lib' / 'gstreamer-1.0'
+    Load GStreamer and its capability index on a worker thread.
+    
+    Safe to call repeatedly; only the first call starts the thread. The
+    environment is set up on the calling thread first, so the worker
+    never writes os.environ while the main loop reads it.
+    
+    Returns:
+        concurrent.futures.Future: Resolves to True once GStreamer is ready.
+        Wrap it with asyncio.wrap_future() to await it from asyncio code.
+    """
+    global _prewarm_future
+    
+    with _gst_lock:
+        if _prewarm_future is not None:
+            return _prewarm_future
         
-        if plugin_path.exists():
-            os.environ['GST_PLUGIN_PATH'] = str(plugin_path)
-            os.environ['GST_PLUGIN_SYSTEM_PATH'] = str(plugin_path)
-            
-            # Disable plugin scanner for frozen apps (already scanned)
-            os.environ['GST_PLUGIN_SCANNER'] = ''
-            
-            # Set registry path to writable location
-            if sys.platform == 'win32':
-                registry_dir = base_dir / 'cache'
-            else:
-                registry_dir = base_dir / '.cache'
-            
-            registry_dir.mkdir(exist_ok=True)
-            os.environ['GST_REGISTRY'] = str(registry_dir / 'gstreamer-registry.bin')
-            os.environ['GST_REGISTRY_UPDATE'] = 'no'
+        future = Future()
+        _prewarm_future = future
+    
+    _configure_environment()
+    
+    def worker():
+        try:
+            _load_gst()
+            get_capability_index()
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(True)
     
-    # Initialize GStreamer
-    Gst.init(None)
+    threading.Thread(target=worker, name='gst-prewarm', daemon=True).start()
+    return future
+
+
+def when_gstreamer_ready(callback, *args):
+    """
+    Call callback(success, *args) on the GLib main loop once GStreamer is loaded.
+    
+    Starts the background pre-warm if it is not already running.
+    """
+    def dispatch(future):
+        callback(future.exception() is None, *args)
+        return GLib.SOURCE_REMOVE
+    
+    prewarm_gstreamer().add_done_callback(lambda future: GLib.idle_add(dispatch, future))
 
 
 def get_gst_version():
@@ -83,9 +337,7 @@ def get_available_plugins():
     Returns:
         list: Plugin names
     """
-    registry = Gst.Registry.get()
-    plugins = registry.get_plugin_list()
-    return [plugin.get_name() for plugin in plugins]
+    return list(get_capability_index().plugins)
 
 
 def check_element_available(element_name):
@@ -98,8 +350,7 @@ def check_element_available(element_name):
     Returns:
         bool: True if element is available
     """
-    factory = Gst.ElementFactory.find(element_name)
-    return factory is not None
+    return get_capability_index().has_element(element_name)
 
 
 def get_supported_formats():
@@ -109,41 +360,215 @@ def get_supported_formats():
     Returns:
         dict: Supported formats by category
     """
-    formats = {
-        'audio_decoders': [],
-        'video_decoders': [],
-        'audio_encoders': [],
-        'video_encoders': [],
-        'demuxers': [],
-        'muxers': [],
-    }
+    formats = get_capability_index().formats
+    return {category: list(names) for category, names in formats.items()}
+
+
+class CapabilityIndex:
+    """
+    Indexed snapshot of the element factories in the GStreamer registry.
     
-    registry = Gst.Registry.get()
+    The registry is walked once per registry generation; afterwards
+    lookups by element, plugin, klass and caps are dictionary hits.
     
-    # Get all features
-    features = registry.get_feature_list(Gst.ElementFactory)
+    Example:
+        index = get_capability_index()
+        index.elements_by_klass('Decoder/Video')
+        index.elements_by_caps('video/x-h264', 'sink')
+    """
     
-    for feature in features:
-        klass = feature.get_metadata('klass')
-        if not klass:
-            continue
+    def __init__(self, key, elements, plugins):
+        """
+        Args:
+            key: Registry generation key the index was built from
+            elements: Mapping of element name to its info dict
+                      ('klass', 'plugin', 'rank', 'sink_caps', 'src_caps')
+            plugins: Mapping of plugin name to its element names
+        """
+        self.key = key
+        self.elements = elements
+        self.plugins = plugins
+        self.formats = {category: [] for category, _ in FORMAT_CATEGORIES}
+        self._by_klass = {}
+        self._by_caps = {}
+        
+        for name, info in elements.items():
+            klass = info['klass']
+            
+            # Index every contiguous run of klass components so that
+            # 'Decoder/Audio' matches 'Codec/Decoder/Audio'
+            parts = klass.split('/') if klass else []
+            for first in range(len(parts)):
+                for last in range(first + 1, len(parts) + 1):
+                    token = '/'.join(parts[first:last])
+                    self._by_klass.setdefault(token, set()).add(name)
             
-        name = feature.get_name()
+            for direction in ('sink', 'src'):
+                for media_type in info[f'{direction}_caps']:
+                    entry = self._by_caps.setdefault(media_type, {'sink': set(), 'src': set()})
+                    entry[direction].add(name)
+            
+            for category, pattern in FORMAT_CATEGORIES:
+                if klass and pattern in klass:
+                    self.formats[category].append(name)
+                    break
+    
+    @classmethod
+    def build(cls, registry, key):
+        """Walk the registry and build a new index."""
+        elements = {}
+        plugins = {plugin.get_name(): [] for plugin in registry.get_plugin_list()}
+        
+        for factory in registry.get_feature_list(Gst.ElementFactory):
+            # Every factory is indexed, klass only drives the lookup tables
+            klass = factory.get_metadata('klass') or ''
+            name = factory.get_name()
+            plugin_name = factory.get_plugin_name()
+            caps = {'sink': set(), 'src': set()}
+            for template in factory.get_static_pad_templates():
+                direction = 'sink' if template.direction == Gst.PadDirection.SINK else 'src'
+                template_caps = template.get_caps()
+                if template_caps.is_any():
+                    caps[direction].add('ANY')
+                    continue
+                for i in range(template_caps.get_size()):
+                    caps[direction].add(template_caps.get_structure(i).get_name())
+            
+            elements[name] = {
+                'klass': klass,
+                'plugin': plugin_name,
+                'rank': factory.get_rank(),
+                'sink_caps': sorted(caps['sink']),
+                'src_caps': sorted(caps['src']),
+            }
+            plugins.setdefault(plugin_name, []).append(name)
+        
+        return cls(key, elements, plugins)
+    
+    @classmethod
+    def load(cls, path, key):
+        """
+        Load a cached index.
+        
+        Returns:
+            CapabilityIndex or None if the cache is missing or stale
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if data.get('version') != CAPABILITY_CACHE_VERSION or data.get('key') != key:
+            return None
+        return cls(key, data['elements'], data['plugins'])
+    
+    def save(self, path):
+        """Write the index to path, replacing any previous cache atomically."""
+        data = {
+            'version': CAPABILITY_CACHE_VERSION,
+            'key': self.key,
+            'elements': self.elements,
+            'plugins': self.plugins,
+        }
+        tmp_path = f'{path}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write GStreamer capability cache: {e}")
+    
+    def has_element(self, name):
+        """Check if an element factory exists."""
+        return name in self.elements
+    
+    def get_element(self, name):
+        """Get the info dict of an element, or None."""
+        return self.elements.get(name)
+    
+    def elements_by_klass(self, klass):
+        """Get element names whose klass contains the given components (e.g. 'Decoder/Video')."""
+        return sorted(self._by_klass.get(klass, ()))
+    
+    def elements_by_caps(self, media_type, direction=None):
+        """
+        Get element names accepting or producing a media type.
         
-        if 'Decoder/Audio' in klass:
-            formats['audio_decoders'].append(name)
-        elif 'Decoder/Video' in klass:
-            formats['video_decoders'].append(name)
-        elif 'Encoder/Audio' in klass:
-            formats['audio_encoders'].append(name)
-        elif 'Encoder/Video' in klass:
-            formats['video_encoders'].append(name)
-        elif 'Demuxer' in klass:
-            formats['demuxers'].append(name)
-        elif 'Muxer' in klass:
-            formats['muxers'].append(name)
+        Args:
+            media_type: Caps structure name (e.g., 'video/x-h264')
+            direction: 'sink', 'src' or None for both
+        """
+        entry = self._by_caps.get(media_type)
+        if not entry:
+            return []
+        if direction is None:
+            return sorted(entry['sink'] | entry['src'])
+        return sorted(entry[direction])
     
-    return formats
+    def elements_by_plugin(self, plugin_name):
+        """Get element names provided by a plugin."""
+        return list(self.plugins.get(plugin_name, ()))
+
+
+def _registry_key(registry):
+    """
+    Key identifying a registry generation across runs.
+    
+    Derived from the GStreamer version and the loaded plugin set, which
+    only requires the plugin list rather than every feature's metadata.
+    """
+    digest = hashlib.sha1(get_gst_version().encode())
+    for plugin in sorted(registry.get_plugin_list(), key=lambda p: p.get_name()):
+        digest.update(f"{plugin.get_name()}:{plugin.get_version()}:{plugin.get_filename()};".encode())
+    return digest.hexdigest()
+
+
+def get_capability_index(refresh=False):
+    """
+    Get the capability index for the current registry.
+    
+    The index is reused while the registry feature list cookie is unchanged
+    and persisted to the user cache dir so warm starts skip the registry walk.
+    
+    Args:
+        refresh: Ignore both the in-memory and on-disk caches
+        
+    Returns:
+        CapabilityIndex
+    """
+    global _capability_index, _capability_cookie
+    
+    with _gst_lock:
+        registry = Gst.Registry.get()
+        cookie = registry.get_feature_list_cookie()
+        if not refresh and _capability_index is not None and cookie == _capability_cookie:
+            return _capability_index
+        
+        key = _registry_key(registry)
+        cache_file = str(get_user_cache_dir() / CAPABILITY_CACHE_FILE)
+        
+        index = None
+        if not refresh:
+            if _capability_index is not None and _capability_index.key == key:
+                index = _capability_index
+            else:
+                index = CapabilityIndex.load(cache_file, key)
+        if index is None:
+            index = CapabilityIndex.build(registry, key)
+            index.save(cache_file)
+        
+        _capability_index = index
+        _capability_cookie = cookie
+        return index
+
+
+def to_uri(location):
+    """Convert a file path to a URI, leaving URIs untouched."""
+    if location.startswith(('file://', 'http://', 'https://', 'rtsp://')):
+        return location
+    return GLib.filename_to_uri(location, None)
 
 
 class SimplePlayer:
@@ -157,29 +582,110 @@ class SimplePlayer:
         player.stop()
     """
     
-    def __init__(self):
-        self._playbin = Gst.ElementFactory.make('playbin', 'player')
+    def __init__(self, playbin=None):
+        """
+        Args:
+            playbin: Optional existing playbin element to drive
+        """
+        self._playbin = playbin or Gst.ElementFactory.make('playbin', 'player')
+        self._uri = None
         self._bus = self._playbin.get_bus()
         self._bus.add_signal_watch()
         
-        # Connect signals
-        self._bus.connect('message::error', self._on_error)
-        self._bus.connect('message::eos', self._on_eos)
-        self._bus.connect('message::state-changed', self._on_state_changed)
+        # Connect signals; (object, handler id) pairs disconnected by dispose()
+        self._handlers = []
+        self._connect(self._bus, 'message::error', self._on_error)
+        self._connect(self._bus, 'message::eos', self._on_eos)
+        self._connect(self._bus, 'message::state-changed', self._on_state_changed)
+        self._connect(self._bus, 'message::async-done', self._on_async_done)
         
         # Callbacks
         self.on_error = None
         self.on_eos = None
         self.on_state_changed = None
+        
+        self.metrics = None
+        
+        # Seek coalescing and playback rate
+        self._rate = 1.0
+        self._seek_in_flight = False
+        self._pending_seek = None
+        # Last position sought in this scrub session, in nanoseconds
+        self._last_seek = None
+        self._scrubbing = False
+    
+    @property
+    def uri(self):
+        """URI currently loaded in the pipeline, or None."""
+        return self._uri
+    
+    def _connect(self, obj, signal, callback):
+        self._handlers.append((obj, obj.connect(signal, callback)))
     
     def play(self, uri):
         """Play media from URI."""
-        if not uri.startswith(('file://', 'http://', 'https://', 'rtsp://')):
-            # Convert file path to URI
-            uri = GLib.filename_to_uri(uri, None)
+        self._set_uri(to_uri(uri))
+        self._playbin.set_state(Gst.State.PLAYING)
+    
+    def preroll(self, uri, state=None):
+        """
+        Load media without starting playback.
+        
+        Args:
+            uri: URI or file path to load
+            state: Gst.State to wait in, PAUSED (default, decoders prerolled)
+                   or READY (resources allocated, nothing decoded)
+        """
+        self._set_uri(to_uri(uri))
+        self._playbin.set_state(state or Gst.State.PAUSED)
+    
+    def rewind(self):
+        """Flush the pipeline and return to the start without a state change."""
+        self._playbin.seek_simple(Gst.Format.TIME, Gst.SeekFlags.FLUSH, 0)
+    
+    def get_state(self):
+        """Get the current Gst.State without waiting for pending changes."""
+        _, state, _ = self._playbin.get_state(0)
+        return state
+    
+    def wait(self, timeout=None):
+        """
+        Block until a pending state change (including a flushing seek) completes.
+        
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
         
+        Returns:
+            Gst.State reached, or None if the change failed or timed out
+        """
+        timeout_ns = Gst.CLOCK_TIME_NONE if timeout is None else int(timeout * Gst.SECOND)
+        result, state, _ = self._playbin.get_state(timeout_ns)
+        if result in (Gst.StateChangeReturn.SUCCESS, Gst.StateChangeReturn.NO_PREROLL):
+            return state
+        return None
+    
+    def dispose(self):
+        """Release the pipeline; the player must not be used afterwards."""
+        self._playbin.set_state(Gst.State.NULL)
+        if self.metrics is not None:
+            self.metrics.detach()
+        for obj, handler_id in self._handlers:
+            obj.disconnect(handler_id)
+        self._handlers.clear()
+        self._bus.remove_signal_watch()
+        self.on_error = None
+        self.on_eos = None
+        self.on_state_changed = None
+    
+    def _set_uri(self, uri):
+        if uri == self._uri:
+            return
+        # playbin only accepts a new uri in READY or NULL
+        if self._uri is not None:
+            self._playbin.set_state(Gst.State.READY)
+        self._reset_seek_state()
         self._playbin.set_property('uri', uri)
-        self._playbin.set_state(Gst.State.PLAYING)
+        self._uri = uri
     
     def pause(self):
         """Pause playback."""
@@ -192,14 +698,107 @@ class SimplePlayer:
     def stop(self):
         """Stop playback."""
         self._playbin.set_state(Gst.State.NULL)
+        self._reset_seek_state()
+    
+    def _reset_seek_state(self):
+        # No ASYNC_DONE arrives for a seek interrupted by READY or NULL
+        self._seek_in_flight = False
+        self._pending_seek = None
+        self._last_seek = None
     
     def seek(self, position_seconds):
         """Seek to position in seconds."""
-        self._playbin.seek_simple(
-            Gst.Format.TIME,
-            Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT,
-            position_seconds * Gst.SECOND
-        )
+        self._pending_seek = None
+        self._do_seek(position_seconds, Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT)
+    
+    @property
+    def scrubbing(self):
+        """True between begin_scrub() and end_scrub()."""
+        return self._scrubbing
+    
+    def begin_scrub(self):
+        """Enter scrubbing mode, e.g. when a seek slider is grabbed."""
+        self._scrubbing = True
+        self._last_seek = None
+    
+    def scrub(self, position_seconds):
+        """
+        Request a fast, keyframe-snapped seek while scrubbing.
+        
+        Requests arriving while a seek is still in flight are coalesced:
+        only the most recent one is issued once the previous completes.
+        """
+        if self._seek_in_flight:
+            self._pending_seek = position_seconds
+            return
+        self._do_seek(position_seconds, self._scrub_flags())
+    
+    def end_scrub(self, position_seconds=None):
+        """
+        Leave scrubbing mode with a frame accurate seek.
+        
+        Args:
+            position_seconds: Final position, defaults to the last requested
+                              one; without any, the position is kept
+        """
+        self._scrubbing = False
+        if position_seconds is None:
+            if self._pending_seek is not None:
+                position_seconds = self._pending_seek
+            elif self._last_seek is not None:
+                position_seconds = self._last_seek / Gst.SECOND
+            else:
+                return
+        self._pending_seek = None
+        # A flushing seek supersedes any seek still in flight
+        self._do_seek(position_seconds, Gst.SeekFlags.FLUSH | Gst.SeekFlags.ACCURATE)
+    
+    def get_rate(self):
+        """Get the playback rate."""
+        return self._rate
+    
+    def set_rate(self, rate):
+        """
+        Change the playback rate.
+        
+        Uses an instant rate change without flushing when GStreamer
+        supports it (1.18+) and the direction is unchanged, otherwise
+        a flushing seek at the current position.
+        """
+        if rate == 0:
+            raise ValueError("Playback rate must not be 0")
+        
+        instant = getattr(Gst.SeekFlags, 'INSTANT_RATE_CHANGE', None)
+        same_direction = (rate > 0) == (self._rate > 0)
+        self._rate = rate
+        
+        if instant is not None and same_direction:
+            if self._playbin.seek(rate, Gst.Format.TIME, instant,
+                                  Gst.SeekType.NONE, -1, Gst.SeekType.NONE, -1):
+                return
+        
+        success, position = self._playbin.query_position(Gst.Format.TIME)
+        if success:
+            self._do_seek(position / Gst.SECOND, Gst.SeekFlags.FLUSH | Gst.SeekFlags.ACCURATE)
+    
+    def _scrub_flags(self):
+        flags = Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT | Gst.SeekFlags.SNAP_NEAREST
+        trickmode_key_units = getattr(Gst.SeekFlags, 'TRICKMODE_KEY_UNITS', None)
+        if trickmode_key_units is not None:
+            flags |= Gst.SeekFlags.TRICKMODE | trickmode_key_units
+        return flags
+    
+    def _do_seek(self, position_seconds, flags):
+        position = max(0, int(position_seconds * Gst.SECOND))
+        if self._rate > 0:
+            start_type, start, stop_type, stop = Gst.SeekType.SET, position, Gst.SeekType.NONE, -1
+        else:
+            # Reverse playback runs from stop towards start
+            start_type, start, stop_type, stop = Gst.SeekType.SET, 0, Gst.SeekType.SET, position
+        
+        self._last_seek = position
+        self._seek_in_flight = self._playbin.seek(
+            self._rate, Gst.Format.TIME, flags, start_type, start, stop_type, stop)
     
     def get_position(self):
         """Get current position in seconds."""
@@ -227,8 +826,47 @@ class SimplePlayer:
         """Set custom video sink element."""
         self._playbin.set_property('video-sink', sink)
     
+    def set_audio_sink(self, sink):
+        """Set custom audio sink element."""
+        self._playbin.set_property('audio-sink', sink)
+    
+    def enable_metrics(self, capacity=256, dump_interval=None):
+        """
+        Start collecting QoS, buffering, latency and stream-status metrics.
+        
+        Args:
+            capacity: Samples kept per ring buffer
+            dump_interval: Seconds between JSON dumps to the user cache
+                           dir, or None to only collect
+        
+        Returns:
+            PipelineMetrics
+        """
+        if self.metrics is None:
+            self.metrics = PipelineMetrics(self._playbin, capacity)
+            self.metrics.attach(self._bus)
+        if dump_interval:
+            self.metrics.start_periodic_dump(dump_interval)
+        return self.metrics
+    
+    def attach_frame_tap(self, caps='video/x-raw,format=RGBA', max_frames=2, display_sink=None):
+        """
+        Tee decoded video into a FrameTap while still displaying it.
+        
+        Call before play(). See FrameTap for the arguments.
+        
+        Returns:
+            FrameTap
+        """
+        if display_sink is None:
+            display_sink = self._playbin.get_property('video-sink')
+        tap = FrameTap(caps, max_frames, display_sink)
+        self.set_video_sink(tap.element)
+        return tap
+    
     def _on_error(self, bus, message):
         error, debug = message.parse_error()
+        self._reset_seek_state()
         if self.on_error:
             self.on_error(error.message, debug)
     
@@ -237,8 +875,948 @@ class SimplePlayer:
         if self.on_eos:
             self.on_eos()
     
+    def _on_async_done(self, bus, message):
+        if message.src != self._playbin:
+            return
+        self._seek_in_flight = False
+        if self._pending_seek is not None:
+            position, self._pending_seek = self._pending_seek, None
+            self._do_seek(position, self._scrub_flags() if self._scrubbing else
+                          Gst.SeekFlags.FLUSH | Gst.SeekFlags.KEY_UNIT)
+    
     def _on_state_changed(self, bus, message):
         if message.src == self._playbin:
             old, new, pending = message.parse_state_changed()
             if self.on_state_changed:
                 self.on_state_changed(old.value_nick, new.value_nick)
+
+
+class PlayerPool:
+    """
+    Bounded pool of warmed SimplePlayer instances keyed by URI.
+    
+    Idle players are kept in PAUSED (or READY) so handing one out for a
+    URI that was played before skips typefinding, decoder autoplugging
+    and sink setup. On a miss with a full pool the least recently used
+    player is recycled by swapping its uri instead of being torn down.
+    
+    Example:
+        pool = PlayerPool(max_size=4)
+        pool.prepare(next_clip)          # optional, preroll ahead of time
+        player = pool.acquire(clip)
+        player.resume()
+        # ... when done
+        pool.release(player)
+    """
+    
+    def __init__(self, max_size=4, preroll=True):
+        """
+        Args:
+            max_size: Maximum number of idle players kept warm
+            preroll: Keep idle players in PAUSED (decoders prerolled)
+                     instead of READY
+        """
+        self.max_size = max_size
+        self.preroll = preroll
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # uri -> SimplePlayer, least recently used first
+        self._idle = OrderedDict()
+    
+    def acquire(self, uri):
+        """
+        Get a player loaded with uri, ready to resume().
+        
+        Returns:
+            SimplePlayer: Owned by the caller until passed to release()
+        """
+        uri = to_uri(uri)
+        player = self._idle.pop(uri, None)
+        if player is not None:
+            self.hits += 1
+            return player
+        
+        self.misses += 1
+        return self._warm(uri)
+    
+    def prepare(self, uri):
+        """Preroll a player for uri so a later acquire() is a hit."""
+        uri = to_uri(uri)
+        if uri in self._idle:
+            self._idle.move_to_end(uri)
+            return
+        self._store(self._warm(uri))
+    
+    def release(self, player):
+        """Return a player to the pool, rewound to the start."""
+        player.on_error = None
+        player.on_eos = None
+        player.on_state_changed = None
+        
+        if player.uri is None:
+            player.dispose()
+            return
+        
+        if self.preroll and player.get_state() in (Gst.State.PAUSED, Gst.State.PLAYING):
+            player.pause()
+            player.rewind()
+        else:
+            player.preroll(player.uri, self._idle_state())
+        self._store(player)
+    
+    def clear(self):
+        """Dispose all idle players."""
+        while self._idle:
+            _, player = self._idle.popitem(last=False)
+            player.dispose()
+    
+    def stats(self):
+        """Get pool counters for tuning max_size."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._idle),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+    
+    def __len__(self):
+        return len(self._idle)
+    
+    def _idle_state(self):
+        return Gst.State.PAUSED if self.preroll else Gst.State.READY
+    
+    def _warm(self, uri):
+        if self._idle and len(self._idle) >= self.max_size:
+            # Recycle the least recently used pipeline with a uri swap
+            _, player = self._idle.popitem(last=False)
+            self.evictions += 1
+        else:
+            player = SimplePlayer()
+        player.preroll(uri, self._idle_state())
+        return player
+    
+    def _store(self, player):
+        previous = self._idle.pop(player.uri, None)
+        if previous is not None and previous is not player:
+            previous.dispose()
+        self._idle[player.uri] = player
+        
+        while len(self._idle) > self.max_size:
+            _, evicted = self._idle.popitem(last=False)
+            evicted.dispose()
+            self.evictions += 1
+
+
+def _get_prefetch_executor():
+    global _prefetch_executor
+    
+    with _gst_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='queue-prefetch')
+        return _prefetch_executor
+
+
+def _prefetch_files(uris):
+    """Warm the OS page cache for local files that are about to be played."""
+    for uri in uris:
+        if not uri.startswith('file://'):
+            continue
+        try:
+            path, _ = GLib.filename_from_uri(uri)
+            with open(path, 'rb') as f:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                else:
+                    f.read(PREFETCH_HEAD_BYTES)
+        except (GLib.Error, OSError):
+            continue
+
+
+class QueuePlayer(SimplePlayer):
+    """
+    SimplePlayer with a play queue and gapless transitions.
+    
+    The next URI is handed to playbin from its about-to-finish signal, so
+    the pipeline switches streams while running instead of going through
+    NULL and rebuilding between items.
+    
+    Example:
+        player = QueuePlayer(prefetch_depth=2)
+        player.on_item_changed = lambda uri: print('Now playing', uri)
+        player.enqueue('/music/01.ogg')
+        player.enqueue('/music/02.ogg')
+        player.start()
+    """
+    
+    def __init__(self, prefetch_depth=1, buffer_low=10, buffer_high=100,
+                 buffer_duration=None, buffer_size=None):
+        """
+        Args:
+            prefetch_depth: Number of upcoming local files to read ahead
+            buffer_low: Pause network streams when buffering drops below this percent
+            buffer_high: Resume once buffering reaches this percent
+            buffer_duration: playbin buffer-duration in seconds, or None for default
+            buffer_size: playbin buffer-size in bytes, or None for default
+        """
+        super().__init__()
+        self.prefetch_depth = prefetch_depth
+        self.buffer_low = buffer_low
+        self.buffer_high = buffer_high
+        
+        if buffer_duration is not None:
+            self._playbin.set_property('buffer-duration', int(buffer_duration * Gst.SECOND))
+        if buffer_size is not None:
+            self._playbin.set_property('buffer-size', buffer_size)
+        
+        # about-to-finish runs on a streaming thread; the lock guards the
+        # queue and the uri handed over there, never a state change
+        self._lock = threading.Lock()
+        self._queue = deque()
+        # Set in about-to-finish, current once its stream starts
+        self._next_uri = None
+        self._prefetched = set()
+        self._want_playing = False
+        self._buffering = False
+        
+        self._connect(self._playbin, 'about-to-finish', self._on_about_to_finish)
+        self._connect(self._bus, 'message::stream-start', self._on_stream_start)
+        self._connect(self._bus, 'message::buffering', self._on_buffering)
+        
+        # Callbacks
+        self.on_item_changed = None
+        self.on_buffering = None
+    
+    @property
+    def queue(self):
+        """Snapshot of the upcoming URIs."""
+        with self._lock:
+            return list(self._queue)
+    
+    def enqueue(self, uri):
+        """Append a URI or file path to the queue."""
+        with self._lock:
+            self._queue.append(to_uri(uri))
+        self._prefetch()
+    
+    def clear_queue(self):
+        """Remove all upcoming items; the current item keeps playing."""
+        with self._lock:
+            self._queue.clear()
+            self._prefetched.clear()
+    
+    def start(self):
+        """Start playing the first queued item."""
+        return self.play_next()
+    
+    def play_next(self):
+        """
+        Skip to the next queued item.
+        
+        Returns:
+            bool: False if the queue is empty
+        """
+        uri = self._pop_next()
+        if uri is None:
+            return False
+        self.play(uri)
+        return True
+    
+    def play(self, uri):
+        """Play a URI or file path now, ahead of the queue."""
+        self._want_playing = True
+        super().play(uri)
+        self._prefetch()
+    
+    def pause(self):
+        """Pause playback; buffering will not resume it."""
+        self._want_playing = False
+        super().pause()
+    
+    def resume(self):
+        """Resume playback, once buffering allows it."""
+        self._want_playing = True
+        super().resume()
+    
+    def stop(self):
+        """Stop playback; the queue is kept."""
+        self._want_playing = False
+        self._buffering = False
+        with self._lock:
+            self._next_uri = None
+        super().stop()
+    
+    def _set_uri(self, uri):
+        # A uri loaded directly replaces any handed over in about-to-finish
+        with self._lock:
+            self._next_uri = None
+        super()._set_uri(uri)
+    
+    def _pop_next(self):
+        with self._lock:
+            if not self._queue:
+                return None
+            uri = self._queue.popleft()
+            self._prefetched.discard(uri)
+            return uri
+    
+    def _prefetch(self):
+        with self._lock:
+            upcoming = [uri for uri in list(self._queue)[:self.prefetch_depth]
+                        if uri not in self._prefetched]
+            self._prefetched.update(upcoming)
+        if upcoming:
+            _get_prefetch_executor().submit(_prefetch_files, upcoming)
+    
+    def _on_about_to_finish(self, playbin):
+        # Setting uri here makes playbin switch to it once the current
+        # stream drains, without leaving PLAYING
+        with self._lock:
+            if not self._queue:
+                return
+            uri = self._queue.popleft()
+            self._prefetched.discard(uri)
+            playbin.set_property('uri', uri)
+            self._next_uri = uri
+        GLib.idle_add(self._prefetch)
+    
+    def _on_stream_start(self, bus, message):
+        with self._lock:
+            if self._next_uri is not None:
+                self._uri, self._next_uri = self._next_uri, None
+        if self.on_item_changed:
+            self.on_item_changed(self.uri)
+    
+    def _on_buffering(self, bus, message):
+        percent = message.parse_buffering()
+        if self.on_buffering:
+            self.on_buffering(percent)
+        
+        if not self._buffering and percent < self.buffer_low:
+            self._buffering = True
+            if self._want_playing:
+                self._playbin.set_state(Gst.State.PAUSED)
+        elif self._buffering and percent >= self.buffer_high:
+            self._buffering = False
+            if self._want_playing:
+                self._playbin.set_state(Gst.State.PLAYING)
+    
+    def _on_eos(self, bus, message):
+        # An item handed over in about-to-finish that never started, or
+        # one enqueued after it fired, still gets played, just not gaplessly
+        with self._lock:
+            pending, self._next_uri = self._next_uri, None
+        if pending is None:
+            pending = self._pop_next()
+        if pending is None:
+            super()._on_eos(bus, message)
+            return
+        # The pipeline is stuck at EOS; go through READY so the next
+        # item starts even when its uri is the one already loaded
+        self._playbin.set_state(Gst.State.READY)
+        self._uri = None
+        self.play(pending)
+
+
+class Frame:
+    """
+    A decoded video frame mapped read-only from its Gst.Buffer.
+    
+    data is a memoryview over the buffer memory and is only valid until
+    release() is called; use the frame as a context manager to release
+    it automatically. The mapping is zero-copy when the gst-python
+    overrides are installed, otherwise PyGObject hands out a copy.
+    
+    Example:
+        with tap.pull() as frame:
+            pixels = frame.as_array()
+            analyse(pixels)
+    """
+    
+    def __init__(self, sample):
+        GstVideo = _load_gst_module('GstVideo')
+        
+        self._buffer = sample.get_buffer()
+        if hasattr(GstVideo.VideoInfo, 'new_from_caps'):
+            self._info = GstVideo.VideoInfo.new_from_caps(sample.get_caps())
+        else:
+            # GStreamer < 1.20
+            self._info = GstVideo.VideoInfo()
+            self._info.from_caps(sample.get_caps())
+        self.width = self._info.width
+        self.height = self._info.height
+        self.format = self._info.finfo.name
+        self.stride = self._info.stride[0]
+        
+        pts = self._buffer.pts
+        self.pts = None if pts == Gst.CLOCK_TIME_NONE else pts / Gst.SECOND
+        
+        result = self._buffer.map(Gst.MapFlags.READ)
+        if isinstance(result, tuple):
+            success, self._map_info = result
+            if not success:
+                raise RuntimeError("Could not map video buffer")
+        else:
+            self._map_info = result
+        self.data = memoryview(self._map_info.data)
+    
+    def as_array(self):
+        """
+        View plane 0 as a NumPy array of shape (height, width, channels).
+        
+        No pixels are copied; the array shares the mapped memory and must
+        not be used after release(). Only packed formats (RGBA, BGRx,
+        GRAY8, ...) are meaningful here.
+        """
+        import numpy
+        
+        pixel_stride = self._info.finfo.pixel_stride[0] or self.stride // self.width
+        return numpy.ndarray(
+            shape=(self.height, self.width, pixel_stride),
+            dtype=numpy.uint8,
+            buffer=self.data,
+            offset=self._info.offset[0],
+            strides=(self.stride, pixel_stride, 1),
+        )
+    
+    def release(self):
+        """Unmap the buffer memory."""
+        if self._map_info is None:
+            return
+        data, self.data = self.data, None
+        try:
+            data.release()
+        except BufferError:
+            # Still exported, e.g. to an array from as_array(); the array
+            # must not be used after this, but the buffer is unmapped anyway
+            pass
+        finally:
+            self._buffer.unmap(self._map_info)
+            self._map_info = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class FrameTap:
+    """
+    Appsink branch for pulling decoded frames out of a playing pipeline.
+    
+    The element is a bin: a tee feeds the display sink and, through a
+    leaky queue, an appsink; together they hold at most max_frames
+    samples. When the consumer falls behind the oldest frames are
+    dropped, and counted in dropped, so analysis code never stalls
+    playback.
+    
+    Example:
+        tap = player.attach_frame_tap(max_frames=2)
+        player.play(uri)
+        while (frame := tap.pull(timeout=1.0)) is not None:
+            with frame:
+                analyse(frame.as_array())
+    """
+    
+    def __init__(self, caps='video/x-raw,format=RGBA', max_frames=2, display_sink=None):
+        """
+        Args:
+            caps: Caps for the analysis branch, or None to keep the decoded
+                  format and skip conversion
+            max_frames: Frames queued for the consumer before dropping the oldest
+            display_sink: Element showing the video, defaults to autovideosink
+        """
+        # Wraps appsink as GstApp.AppSink so try_pull_sample() is callable
+        _load_gst_module('GstApp')
+        
+        self.max_frames = max_frames
+        self.dropped = 0
+        self.on_frame = None
+        self._new_sample_handler = None
+        
+        self.element = Gst.Bin.new('frame-tap')
+        tee = Gst.ElementFactory.make('tee', 'tee')
+        display_queue = Gst.ElementFactory.make('queue', 'display-queue')
+        if display_sink is None:
+            display_sink = Gst.ElementFactory.make('autovideosink', 'display-sink')
+        
+        # Only the leaky queue drops frames, so every drop is counted:
+        # the appsink holds one frame and blocks the tap branch when full
+        tap_queue = Gst.ElementFactory.make('queue', 'tap-queue')
+        tap_queue.set_property('leaky', 2)  # downstream: drop the oldest buffers
+        tap_queue.set_property('max-size-buffers', max(max_frames - 1, 1))
+        tap_queue.set_property('max-size-bytes', 0)
+        tap_queue.set_property('max-size-time', 0)
+        tap_queue.connect('overrun', self._on_overrun)
+        
+        self._appsink = Gst.ElementFactory.make('appsink', 'frame-sink')
+        self._appsink.set_property('max-buffers', 1)
+        self._appsink.set_property('drop', False)
+        self._appsink.set_property('sync', False)
+        self._appsink.set_property('emit-signals', False)
+        
+        tap_chain = [tap_queue]
+        if caps is not None:
+            convert = Gst.ElementFactory.make('videoconvert', 'tap-convert')
+            if convert.find_property('n-threads'):
+                convert.set_property('n-threads', 0)
+            tap_chain.append(convert)
+            self._appsink.set_property('caps', Gst.Caps.from_string(caps))
+        tap_chain.append(self._appsink)
+        
+        for element in [tee, display_queue, display_sink] + tap_chain:
+            self.element.add(element)
+        tee.link(display_queue)
+        display_queue.link(display_sink)
+        tee.link(tap_queue)
+        for upstream, downstream in zip(tap_chain, tap_chain[1:]):
+            upstream.link(downstream)
+        
+        self.element.add_pad(Gst.GhostPad.new('sink', tee.get_static_pad('sink')))
+    
+    def pull(self, timeout=None):
+        """
+        Get the oldest queued frame.
+        
+        Args:
+            timeout: Seconds to wait, or None to wait until a frame arrives
+        
+        Returns:
+            Frame or None on timeout, EOS or flush. Release it when done.
+        """
+        timeout_ns = Gst.CLOCK_TIME_NONE if timeout is None else int(timeout * Gst.SECOND)
+        sample = self._appsink.try_pull_sample(timeout_ns)
+        if sample is None:
+            return None
+        return Frame(sample)
+    
+    def set_on_frame(self, callback):
+        """
+        Push frames to callback(frame) from the streaming thread instead of pulling.
+        
+        The frame is released when the callback returns; copy anything
+        that must outlive it. Pass None to go back to pull().
+        """
+        self.on_frame = callback
+        self._appsink.set_property('emit-signals', callback is not None)
+        if callback is not None and self._new_sample_handler is None:
+            self._new_sample_handler = self._appsink.connect('new-sample', self._on_new_sample)
+    
+    def _on_new_sample(self, appsink):
+        sample = appsink.try_pull_sample(0)
+        if sample is not None and self.on_frame:
+            with Frame(sample) as frame:
+                self.on_frame(frame)
+        return Gst.FlowReturn.OK
+    
+    def _on_overrun(self, queue):
+        self.dropped += 1
+
+
+def enable_latency_tracing(flags='pipeline+element'):
+    """
+    Turn on the GStreamer latency tracer for PipelineMetrics.
+    
+    Tracers are read from the environment by Gst.init, so this must be
+    called before GStreamer is loaded.
+    
+    Returns:
+        bool: False if GStreamer was already loaded
+    """
+    global _latency_tracing, _tracer_owns_debug_output
+    
+    if _gst_module is not None:
+        return False
+    
+    entry = f'latency(flags={flags})'
+    tracers = os.environ.get('GST_TRACERS')
+    os.environ['GST_TRACERS'] = f'{tracers};{entry}' if tracers else entry
+    
+    # Tracer records are logged at TRACE level in the GST_TRACER category
+    debug = os.environ.get('GST_DEBUG')
+    os.environ['GST_DEBUG'] = f'{debug},GST_TRACER:7' if debug else 'GST_TRACER:7'
+    _tracer_owns_debug_output = not debug
+    _latency_tracing = True
+    return True
+
+
+def _install_tracer_log_function():
+    """Route latency tracer records to PipelineMetrics, once per process."""
+    global _latency_tracing
+    
+    if not _latency_tracing:
+        return
+    _latency_tracing = False
+    
+    if _tracer_owns_debug_output:
+        # Nobody asked for debug output, keep the records off stderr
+        Gst.debug_remove_log_function(None)
+    Gst.debug_add_log_function(_on_tracer_log, None)
+
+
+def _on_tracer_log(category, level, file, function, line, obj, message, user_data):
+    # Runs on whichever thread logged the record
+    if category.get_name() != 'GST_TRACER':
+        return
+    structure = Gst.Structure.new_from_string(message.get())
+    if structure is None:
+        return
+    
+    name = structure.get_name()
+    if name == 'element-latency':
+        element = structure.get_string('element')
+    elif name == 'latency':
+        element = f"{structure.get_string('src-element')}->{structure.get_string('sink-element')}"
+    else:
+        return
+    success, latency = structure.get_uint64('time')
+    if not success:
+        return
+    for collector in list(_metrics_collectors):
+        collector.add_element_latency(element, latency)
+
+
+class PipelineMetrics:
+    """
+    Opt-in collector for pipeline health messages.
+    
+    Aggregates QoS drops and jitter, buffering percentages, pipeline
+    latency and stream-status messages from the bus, plus per-element
+    processing latency from the latency tracer when
+    enable_latency_tracing() ran before GStreamer was loaded. Samples
+    live in fixed size ring buffers so memory stays bounded.
+    
+    Example:
+        metrics = player.enable_metrics(dump_interval=60)
+        ...
+        print(metrics.snapshot())
+    """
+    
+    def __init__(self, pipeline, capacity=256):
+        self._pipeline = pipeline
+        self.capacity = capacity
+        # Tracer records arrive on streaming threads
+        self._lock = threading.Lock()
+        self._bus = None
+        self._handlers = []
+        self._dump_source = None
+        
+        # (monotonic time, element, jitter ns, proportion)
+        self.qos = deque(maxlen=capacity)
+        # (monotonic time, percent)
+        self.buffering = deque(maxlen=capacity)
+        # (monotonic time, live, min ns, max ns)
+        self.latency = deque(maxlen=capacity)
+        # element -> deque of processing latency ns
+        self.element_latency = {}
+        # element -> (processed, dropped), cumulative as reported by QoS
+        self.qos_stats = {}
+        # status nick -> message count
+        self.stream_status = {}
+    
+    def attach(self, bus):
+        """Start listening on a bus that already has a signal watch."""
+        _install_tracer_log_function()
+        self._bus = bus
+        self._handlers = [
+            bus.connect('message::qos', self._on_qos),
+            bus.connect('message::buffering', self._on_buffering),
+            bus.connect('message::latency', self._on_latency),
+            bus.connect('message::stream-status', self._on_stream_status),
+        ]
+        _metrics_collectors.add(self)
+    
+    def detach(self):
+        """Stop collecting and dumping."""
+        self.stop_periodic_dump()
+        _metrics_collectors.discard(self)
+        if self._bus is not None:
+            for handler in self._handlers:
+                self._bus.disconnect(handler)
+            self._bus = None
+            self._handlers = []
+    
+    def add_element_latency(self, element, latency_ns):
+        """Record one processing latency sample for an element."""
+        with self._lock:
+            samples = self.element_latency.get(element)
+            if samples is None:
+                samples = self.element_latency[element] = deque(maxlen=self.capacity)
+            samples.append(latency_ns)
+    
+    def snapshot(self):
+        """
+        Summarize the collected samples.
+        
+        Returns:
+            dict: JSON-serializable metrics, times in milliseconds
+        """
+        with self._lock:
+            element_latency = {element: list(samples)
+                               for element, samples in self.element_latency.items()}
+        
+        jitters = [abs(jitter) for _, _, jitter, _ in self.qos]
+        buffering = [percent for _, percent in self.buffering]
+        
+        snapshot = {
+            'qos': {
+                'events': len(self.qos),
+                'processed': sum(processed for processed, _ in self.qos_stats.values()),
+                'dropped': sum(dropped for _, dropped in self.qos_stats.values()),
+                'dropped_by_element': {element: dropped
+                                       for element, (_, dropped) in self.qos_stats.items()},
+                'mean_jitter_ms': sum(jitters) / len(jitters) / Gst.MSECOND if jitters else 0.0,
+                'max_jitter_ms': max(jitters) / Gst.MSECOND if jitters else 0.0,
+                'last_proportion': self.qos[-1][3] if self.qos else None,
+            },
+            'buffering': {
+                'last_percent': buffering[-1] if buffering else None,
+                'min_percent': min(buffering) if buffering else None,
+                'samples': len(buffering),
+            },
+            'latency': None,
+            'element_latency': {
+                element: {
+                    'mean_ms': sum(samples) / len(samples) / Gst.MSECOND,
+                    'max_ms': max(samples) / Gst.MSECOND,
+                    'samples': len(samples),
+                }
+                for element, samples in element_latency.items() if samples
+            },
+            'stream_status': dict(self.stream_status),
+        }
+        if self.latency:
+            _, live, min_latency, max_latency = self.latency[-1]
+            snapshot['latency'] = {
+                'live': live,
+                'min_ms': min_latency / Gst.MSECOND,
+                'max_ms': max_latency / Gst.MSECOND if max_latency != Gst.CLOCK_TIME_NONE else None,
+            }
+        return snapshot
+    
+    def dump(self, path=None):
+        """
+        Write snapshot() as JSON.
+        
+        Args:
+            path: Target file, defaults to metrics/pipeline-<pid>.json
+                  in the user cache dir
+        """
+        if path is None:
+            path = get_user_cache_dir() / 'metrics' / f'pipeline-{os.getpid()}.json'
+        path = str(path)
+        data = {'timestamp': time.time(), 'metrics': self.snapshot()}
+        tmp_path = f'{path}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write pipeline metrics: {e}")
+    
+    def start_periodic_dump(self, interval):
+        """Call dump() every interval seconds from the main loop."""
+        self.stop_periodic_dump()
+        self._dump_source = GLib.timeout_add_seconds(interval, self._on_dump_timeout)
+    
+    def stop_periodic_dump(self):
+        if self._dump_source is not None:
+            GLib.source_remove(self._dump_source)
+            self._dump_source = None
+    
+    def _on_dump_timeout(self):
+        self.dump()
+        return GLib.SOURCE_CONTINUE
+    
+    def _on_qos(self, bus, message):
+        element = message.src.get_name()
+        jitter, proportion, _ = message.parse_qos_values()
+        _, processed, dropped = message.parse_qos_stats()
+        self.qos.append((time.monotonic(), element, jitter, proportion))
+        self.qos_stats[element] = (processed, dropped)
+    
+    def _on_buffering(self, bus, message):
+        self.buffering.append((time.monotonic(), message.parse_buffering()))
+    
+    def _on_latency(self, bus, message):
+        # Applications are expected to redistribute latency on this message
+        self._pipeline.recalculate_latency()
+        query = Gst.Query.new_latency()
+        if self._pipeline.query(query):
+            live, min_latency, max_latency = query.parse_latency()
+            self.latency.append((time.monotonic(), live, min_latency, max_latency))
+    
+    def _on_stream_status(self, bus, message):
+        status_type, _ = message.parse_stream_status()
+        nick = status_type.value_nick
+        self.stream_status[nick] = self.stream_status.get(nick, 0) + 1
+
+
+class PositionTracker(GObject.Object):
+    """
+    Position and duration updates for a SimplePlayer from the main loop.
+    
+    A single GLib timeout emits position-changed while playing. The
+    pipeline is only queried every query interval; in between the
+    position is extrapolated from the pipeline clock. The interval grows
+    while extrapolation stays accurate and drops back after seeks or
+    drift. The duration is cached until a DURATION_CHANGED message.
+    
+    Example:
+        tracker = PositionTracker(player)
+        tracker.connect('position-changed', lambda t, pos, dur: slider.set_value(pos))
+    """
+    
+    __gsignals__ = {
+        'position-changed': (GObject.SignalFlags.RUN_FIRST, None, (float, float)),
+        'duration-changed': (GObject.SignalFlags.RUN_FIRST, None, (float,)),
+    }
+    
+    def __init__(self, player, interval_ms=100, min_query_interval=0.1,
+                 max_query_interval=2.0, tolerance=0.02):
+        """
+        Args:
+            player: SimplePlayer to track
+            interval_ms: Milliseconds between position-changed emissions while playing
+            min_query_interval: Seconds between pipeline queries after a seek or drift
+            max_query_interval: Upper bound the query interval can grow to
+            tolerance: Extrapolation error in seconds accepted before
+                       the query interval is reset
+        """
+        super().__init__()
+        self._player = player
+        self._pipeline = player._playbin
+        self.interval_ms = interval_ms
+        self.min_query_interval = min_query_interval
+        self.max_query_interval = max_query_interval
+        self.tolerance = tolerance
+        
+        self.queries = 0
+        self._query_interval = min_query_interval
+        self._timeout = None
+        self._duration = None
+        # Position in seconds and pipeline clock time in ns of the last query
+        self._anchor_position = 0.0
+        self._anchor_clock = None
+        self._position = 0.0
+        
+        bus = player._bus
+        self._handlers = [
+            bus.connect('message::state-changed', self._on_state_changed),
+            bus.connect('message::duration-changed', self._on_duration_changed),
+            bus.connect('message::async-done', self._on_async_done),
+        ]
+    
+    @property
+    def position(self):
+        """Last emitted position in seconds; never queries the pipeline."""
+        return self._position
+    
+    @property
+    def duration(self):
+        """Cached duration in seconds, 0 if unknown; never queries the pipeline."""
+        return self._duration or 0.0
+    
+    def destroy(self):
+        """Stop the timer and disconnect from the player."""
+        self._stop_timer()
+        for handler in self._handlers:
+            self._player._bus.disconnect(handler)
+        self._handlers = []
+    
+    def _clock_time(self):
+        clock = self._pipeline.get_clock()
+        if clock is None:
+            return None
+        return clock.get_time()
+    
+    def _query(self):
+        """Query the pipeline and re-anchor the extrapolation."""
+        self.queries += 1
+        if self._duration is None:
+            success, duration = self._pipeline.query_duration(Gst.Format.TIME)
+            if success:
+                self._duration = duration / Gst.SECOND
+                self.emit('duration-changed', self._duration)
+        
+        success, position = self._pipeline.query_position(Gst.Format.TIME)
+        if not success:
+            return None
+        self._anchor_position = position / Gst.SECOND
+        self._anchor_clock = self._clock_time()
+        return self._anchor_position
+    
+    def _update(self, force_query=False):
+        now = self._clock_time()
+        predicted = None
+        anchor_age = None
+        if now is not None and self._anchor_clock is not None:
+            anchor_age = (now - self._anchor_clock) / Gst.SECOND
+            predicted = self._anchor_position + anchor_age * self._player.get_rate()
+        
+        if force_query or anchor_age is None or anchor_age >= self._query_interval:
+            position = self._query()
+            if position is None:
+                position = predicted if predicted is not None else self._position
+            elif predicted is not None and not force_query and abs(position - predicted) <= self.tolerance:
+                # Extrapolation is tracking well, query less often
+                self._query_interval = min(self._query_interval * 2, self.max_query_interval)
+            else:
+                self._query_interval = self.min_query_interval
+        else:
+            position = predicted
+        
+        if self._duration:
+            position = min(max(position, 0.0), self._duration)
+        self._position = position
+        self.emit('position-changed', position, self.duration)
+    
+    def _on_timeout(self):
+        self._update()
+        return GLib.SOURCE_CONTINUE
+    
+    def _start_timer(self):
+        if self._timeout is None:
+            self._timeout = GLib.timeout_add(self.interval_ms, self._on_timeout)
+    
+    def _stop_timer(self):
+        if self._timeout is not None:
+            GLib.source_remove(self._timeout)
+            self._timeout = None
+    
+    def _on_state_changed(self, bus, message):
+        if message.src != self._pipeline:
+            return
+        old, new, pending = message.parse_state_changed()
+        if new == Gst.State.PLAYING:
+            self._query_interval = self.min_query_interval
+            self._update(force_query=True)
+            self._start_timer()
+        elif new == Gst.State.PAUSED:
+            self._stop_timer()
+            self._update(force_query=True)
+        else:
+            self._stop_timer()
+            self._anchor_clock = None
+            self._duration = None
+            self._position = 0.0
+            self.emit('position-changed', 0.0, 0.0)
+    
+    def _on_duration_changed(self, bus, message):
+        self._duration = None
+        success, duration = self._pipeline.query_duration(Gst.Format.TIME)
+        if success:
+            self._duration = duration / Gst.SECOND
+            self.emit('duration-changed', self._duration)
+    
+    def _on_async_done(self, bus, message):
+        # Seeks complete with ASYNC_DONE, the old anchor is meaningless now
+        if message.src != self._pipeline:
+            return
+        self._query_interval = self.min_query_interval
+        self._update(force_query=True)
@@ -0,0 +1,257 @@
+"""Language resolution and translation catalog loading.
+
+Catalogs are read through mmap with lookups done in place instead of
+parsing the whole file into a dict.
+"""
+
+import gettext
+import locale
+import mmap
+import os
+import struct
+import sys
+
+# Environment variables consulted in the same order as GNU gettext
+LANGUAGE_ENV_VARS = ('LANGUAGE', 'LC_ALL', 'LC_MESSAGES', 'LANG')
+
+DEFAULT_LANGUAGES = ['en', 'en_US']
+
+_MO_LE_MAGIC = 0x950412de
+_MO_BE_MAGIC = 0xde120495
+
+
+class MappedTranslations(gettext.NullTranslations):
+    """
+    GNU .mo catalog looked up in place through mmap.
+    
+    Nothing is parsed up front except the header; each lookup is a
+    binary search over the sorted original strings table.
+    """
+    
+    def __init__(self, path):
+        super().__init__()
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            magic = struct.unpack_from('<I', self._mmap, 0)[0]
+            if magic == _MO_LE_MAGIC:
+                self._order = '<'
+            elif magic == _MO_BE_MAGIC:
+                self._order = '>'
+            else:
+                raise OSError(0, 'Bad magic number', path)
+            
+            version, self._count, self._originals, self._translations = struct.unpack_from(
+                self._order + '4I', self._mmap, 4)
+            if version >> 16 not in (0, 1):
+                raise OSError(0, 'Bad version number', path)
+        except struct.error:
+            self._mmap.close()
+            raise OSError(0, 'Truncated catalog', path)
+        
+        self._cache = {}
+        self._parse_header()
+    
+    def _string(self, table, index):
+        length, offset = struct.unpack_from(self._order + '2I', self._mmap, table + index * 8)
+        return self._mmap[offset:offset + length]
+    
+    def _find(self, key, prefix=False):
+        """Binary search the originals table, returning the translation bytes or None."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(self._originals, middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count:
+            original = self._string(self._originals, low)
+            if original == key or (prefix and original.startswith(key)):
+                return self._string(self._translations, low)
+        return None
+    
+    def _parse_header(self):
+        self._charset = 'utf-8'
+        self.plural = lambda n: int(n != 1)
+        header = self._find(b'')
+        if header is None:
+            return
+        for line in header.decode('ascii', 'replace').split('\n'):
+            key, _, value = line.partition(':')
+            key = key.strip().lower()
+            value = value.strip()
+            if not key:
+                continue
+            self._info[key] = value
+            if key == 'content-type' and 'charset=' in value:
+                self._charset = value.split('charset=')[1].split(';')[0].strip()
+            elif key == 'plural-forms':
+                expression = value.split(';')[1].split('plural=')[1]
+                self.plural = gettext.c2py(expression)
+    
+    def _lookup(self, key, prefix=False):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        translation = self._find(key, prefix)
+        if translation is not None:
+            translation = translation.decode(self._charset)
+        self._cache[key] = translation
+        return translation
+    
+    def _lookup_singular(self, key):
+        translation = self._lookup(key)
+        if translation is None:
+            # Like GNUTranslations, a plural entry also translates its singular
+            translation = self._lookup(key + b'\0', prefix=True)
+            if translation is not None:
+                translation = translation.split('\0')[0]
+        return translation
+    
+    def gettext(self, message):
+        translation = self._lookup_singular(message.encode(self._charset))
+        if translation is not None:
+            return translation
+        if self._fallback:
+            return self._fallback.gettext(message)
+        return message
+    
+    def ngettext(self, msgid1, msgid2, n):
+        # Plural entries are keyed "singular\0plural", match on the singular
+        translation = self._lookup(msgid1.encode(self._charset) + b'\0', prefix=True)
+        if translation is not None:
+            forms = translation.split('\0')
+            index = self.plural(n)
+            if index < len(forms):
+                return forms[index]
+        if self._fallback:
+            return self._fallback.ngettext(msgid1, msgid2, n)
+        return msgid1 if n == 1 else msgid2
+    
+    def pgettext(self, context, message):
+        key = f'{context}\x04{message}'.encode(self._charset)
+        translation = self._lookup_singular(key)
+        if translation is not None:
+            return translation
+        if self._fallback:
+            return self._fallback.pgettext(context, message)
+        return message
+    
+    def npgettext(self, context, msgid1, msgid2, n):
+        key = f'{context}\x04{msgid1}'.encode(self._charset) + b'\0'
+        translation = self._lookup(key, prefix=True)
+        if translation is not None:
+            forms = translation.split('\0')
+            index = self.plural(n)
+            if index < len(forms):
+                return forms[index]
+        if self._fallback:
+            return self._fallback.npgettext(context, msgid1, msgid2, n)
+        return msgid1 if n == 1 else msgid2
+
+
+def detect_language():
+    """Get the user's preferred language code, e.g. 'ar_SY', or None."""
+    for variable in LANGUAGE_ENV_VARS:
+        value = os.environ.get(variable)
+        if value:
+            return value.split(':')[0]
+    
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            lang_id = ctypes.windll.kernel32.GetUserDefaultUILanguage()
+            return locale.windows_locale.get(lang_id)
+        except Exception as e:
+            print(e)
+    return None
+
+
+def _catalog_path(localedir, language, domain):
+    return os.path.join(localedir, language, 'LC_MESSAGES', f'{domain}.mo')
+
+
+def resolve_languages(domain, localedir, language=None):
+    """
+    Resolve the language list and catalog for the user's language.
+    
+    At most two candidates are probed, the full language code and the
+    bare language, which is cheaper than any cache of the result.
+    
+    Args:
+        domain: Gettext domain
+        localedir: Directory containing <lang>/LC_MESSAGES/<domain>.mo
+        language: Language code, detected when None
+        
+    Returns:
+        tuple: (languages in preference order, catalog path or None)
+    """
+    if language is None:
+        language = detect_language()
+    if not language:
+        return list(DEFAULT_LANGUAGES), None
+    
+    language = language.split('.')[0].split('@')[0]
+    languages = []
+    catalog = None
+    for candidate in dict.fromkeys([language, language.split('_')[0]]):
+        path = _catalog_path(localedir, candidate, domain)
+        if catalog is None and os.path.isfile(path):
+            catalog = path
+            languages.insert(0, candidate)
+        else:
+            languages.append(candidate)
+    return languages, catalog
+
+
+def load_translations(catalog):
+    """
+    Load a catalog through mmap, falling back to the stdlib parser.
+    
+    Returns:
+        gettext.NullTranslations subclass, NullTranslations if catalog is None
+        or cannot be read
+    """
+    if catalog is None:
+        return gettext.NullTranslations()
+    try:
+        return MappedTranslations(catalog)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not map translations {catalog}: {e}")
+    try:
+        with open(catalog, 'rb') as f:
+            return gettext.GNUTranslations(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not load translations: {e}")
+    return gettext.NullTranslations()
+
+
+def install(domain, localedir, languages=None, catalog=None, set_lang_env=False):
+    """
+    Install _() for the user's language.
+    
+    Args:
+        domain: Gettext domain
+        localedir: Directory containing the compiled catalogs
+        languages, catalog: Result of resolve_languages(), resolved when omitted
+        set_lang_env: Export the resolved language as LANG, needed where
+                      GTK's own gettext has no other source (Windows)
+                      
+    Returns:
+        tuple: (translations, languages)
+    """
+    if languages is None:
+        languages, catalog = resolve_languages(domain, localedir)
+    
+    if set_lang_env:
+        if catalog:
+            os.environ['LANG'] = languages[0]
+        elif not os.environ.get('LANG'):
+            os.environ['LANG'] = 'en'
+    
+    translations = load_translations(catalog)
+    translations.install()
+    return translations, languages
@@ -0,0 +1,181 @@
+"""Batched GSettings access.
+
+Settings are opened in delay-apply mode: writes, including those made
+by bound properties such as the window size during an interactive
+resize, only change an in-memory copy. They are applied in one batch
+once no write came for FLUSH_DELAY_MS, and when the window unmaps or
+the application quits, so the backend sees one write per key and burst
+instead of one per change.
+
+Reads are served from a cache, refreshed when a key changes, so hot
+code never queries the backend.
+"""
+
+import weakref
+
+from gi.repository import Gio, GLib
+
+from {{ NEW_NAME }}.paths import APP_ID
+
+SCHEMA_PATH = '{{ GIORESOURCE_ID }}/'
+
+# Quiet time after the last write before the batch is applied
+FLUSH_DELAY_MS = 500
+
+_settings = None
+_instances = weakref.WeakSet()
+
+
+class DelayedSettings:
+    """
+    Gio.Settings wrapper that batches writes and caches reads.
+
+    Attributes:
+        changes: Writes made, directly or by bindings
+        flushes: Batches applied to the backend
+        coalesced: Writes that did not cost a backend write of their own,
+                   replaced by a later write of the same key or applied
+                   in the same batch as another write
+    """
+
+    def __init__(self, schema_id, path=None, flush_delay=FLUSH_DELAY_MS):
+        if path:
+            self.settings = Gio.Settings.new_with_path(schema_id, path)
+        else:
+            self.settings = Gio.Settings.new(schema_id)
+        self.settings.delay()
+        self.flush_delay = flush_delay
+        self.changes = 0
+        self.flushes = 0
+        self.coalesced = 0
+        self._cache = {}
+        self._pending = set()
+        self._pending_changes = 0
+        self._timeout_source = None
+        self._idle_source = None
+        self.settings.connect("changed", self._on_changed)
+        _instances.add(self)
+
+    def _on_changed(self, settings, key):
+        self._cache.pop(key, None)
+        if settings.get_has_unapplied():
+            # A delayed write, not the backend reporting an applied or external change
+            self.changes += 1
+            self._pending_changes += 1
+            self._pending.add(key)
+            self._schedule_flush()
+
+    # Reads
+
+    def get(self, key):
+        """Get a value as a Python object, from the cache."""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = self.settings.get_value(key).unpack()
+            return value
+
+    def get_int(self, key):
+        return int(self.get(key))
+
+    def get_double(self, key):
+        return float(self.get(key))
+
+    def get_boolean(self, key):
+        return bool(self.get(key))
+
+    def get_string(self, key):
+        return str(self.get(key))
+
+    def get_strv(self, key):
+        return list(self.get(key))
+
+    # Writes
+
+    def set(self, key, value):
+        """
+        Set a value, applied with the next batch.
+
+        Returns:
+            bool: False if the key already had this value
+        """
+        if self.get(key) == value:
+            return False
+        variant_type = self.settings.get_value(key).get_type_string()
+        self.settings.set_value(key, GLib.Variant(variant_type, value))
+        return True
+
+    def bind(self, key, obj, prop, flags=Gio.SettingsBindFlags.DEFAULT):
+        """Bind a key to a property; property changes are batched like set()."""
+        self.settings.bind(key, obj, prop, flags)
+
+    def _schedule_flush(self):
+        # Restart the quiet period on every write
+        if self._timeout_source is not None:
+            GLib.source_remove(self._timeout_source)
+        self._timeout_source = GLib.timeout_add(self.flush_delay, self._on_flush_timeout)
+
+    def _on_flush_timeout(self):
+        self._timeout_source = None
+        # Apply once the main loop has nothing more urgent to do
+        if self._idle_source is None:
+            self._idle_source = GLib.idle_add(self._on_flush_idle, priority=GLib.PRIORITY_LOW)
+        return GLib.SOURCE_REMOVE
+
+    def _on_flush_idle(self):
+        self._idle_source = None
+        self.flush()
+        return GLib.SOURCE_REMOVE
+
+    def _cancel_flush(self):
+        for attribute in ("_timeout_source", "_idle_source"):
+            source = getattr(self, attribute)
+            if source is not None:
+                GLib.source_remove(source)
+                setattr(self, attribute, None)
+
+    def flush(self):
+        """Apply pending writes now."""
+        self._cancel_flush()
+        if not self.settings.get_has_unapplied():
+            self._pending.clear()
+            self._pending_changes = 0
+            return
+        self.settings.apply()
+        self.flushes += 1
+        self.coalesced += max(self._pending_changes - 1, 0)
+        self._pending.clear()
+        self._pending_changes = 0
+
+    def revert(self):
+        """Drop pending writes."""
+        self._cancel_flush()
+        self.settings.revert()
+        self._cache.clear()
+        self._pending.clear()
+        self._pending_changes = 0
+
+    def get_stats(self):
+        """Write counters, e.g. for a debug print."""
+        return {
+            'changes': self.changes,
+            'flushes': self.flushes,
+            'coalesced': self.coalesced,
+            'pending_keys': sorted(self._pending),
+        }
+
+
+def get_settings():
+    """Get the shared settings of the application schema."""
+    global _settings
+
+    if _settings is None:
+        _settings = DelayedSettings(APP_ID, SCHEMA_PATH)
+    return _settings
+
+
+def flush_all():
+    """Apply pending writes of every settings object and wait for the backend."""
+    for instance in list(_instances):
+        instance.flush()
+    Gio.Settings.sync()
@@ -0,0 +1,210 @@
+"""Startup timeline tracing.
+
+Enabled by setting the <APP_NAME>_TRACE_STARTUP environment variable
+(to 1 or an output path) or by passing --trace-startup[=FILE]. Phases,
+gi.repository import times and the time to the first painted frame are
+written as Chrome trace JSON, viewable in ui.perfetto.dev or
+chrome://tracing.
+
+When tracing is disabled every helper here is a no-op.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from {{ NEW_NAME }}.paths import APP_NAME, get_user_cache_dir
+
+# Taken at import so the trace starts as early as possible
+_START_NS = time.perf_counter_ns()
+
+TRACE_ENV = f"{APP_NAME.upper()}_TRACE_STARTUP"
+TRACE_FLAG = "--trace-startup"
+
+_tracer = None
+_disabled = nullcontext()
+
+
+class StartupTracer:
+    """Collects trace events and writes them in Chrome trace format."""
+
+    def __init__(self, path):
+        self.path = path
+        self.events = []
+        self.finished = False
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def now(self):
+        """Microseconds since the tracer module was imported."""
+        return (time.perf_counter_ns() - _START_NS) / 1000
+
+    def add_complete(self, name, start, end, category="startup", **args):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start,
+            "dur": end - start,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def add_instant(self, name, category="startup", **args):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "p",
+            "ts": self.now(),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    @contextmanager
+    def phase(self, name, category="startup", **args):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.add_complete(name, start, self.now(), category, **args)
+
+    def write(self):
+        """Write the trace file, returning its path or None on failure."""
+        with self._lock:
+            events = list(self.events)
+        data = {
+            "traceEvents": [
+                {"name": "process_name", "ph": "M", "pid": self._pid,
+                 "args": {"name": APP_NAME}},
+            ] + events,
+            "displayTimeUnit": "ms",
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Warning: Could not write startup trace: {e}")
+            return None
+        return self.path
+
+
+class _TimedLoader:
+    """Loader wrapper recording how long a module takes to import."""
+
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        if _tracer is None:
+            return self._loader.create_module(spec)
+        with _tracer.phase(f"import {self._name}", "import"):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        if _tracer is None:
+            return self._loader.exec_module(module)
+        with _tracer.phase(f"import {self._name}", "import"):
+            return self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer:
+    """Meta path finder that wraps the loaders of gi.repository modules."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if not fullname.startswith("gi.repository."):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None:
+                spec.loader = _TimedLoader(spec.loader, fullname)
+            return spec
+        return None
+
+
+def _default_trace_path():
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return str(get_user_cache_dir() / "traces" / f"startup-{stamp}.json")
+
+
+def enable_from_args(argv):
+    """
+    Enable tracing if requested by environment variable or command line.
+
+    The --trace-startup flag is removed from argv in place so it never
+    reaches Gio.Application option parsing.
+
+    Returns:
+        StartupTracer or None
+    """
+    global _tracer
+
+    path = None
+    for arg in list(argv[1:]):
+        if arg == TRACE_FLAG or arg.startswith(TRACE_FLAG + "="):
+            argv.remove(arg)
+            path = arg.partition("=")[2] or _default_trace_path()
+
+    if path is None:
+        value = os.environ.get(TRACE_ENV)
+        if not value or value == "0":
+            return None
+        path = _default_trace_path() if value == "1" else value
+
+    _tracer = StartupTracer(path)
+    sys.meta_path.insert(0, _ImportTimer())
+    atexit.register(finish)
+    return _tracer
+
+
+def is_enabled():
+    """Check if startup tracing is active."""
+    return _tracer is not None
+
+
+def phase(name, **args):
+    """Context manager recording a startup phase; a no-op when disabled."""
+    if _tracer is None or _tracer.finished:
+        return _disabled
+    return _tracer.phase(name, **args)
+
+
+def mark(name, **args):
+    """Record an instant event."""
+    if _tracer is not None and not _tracer.finished:
+        _tracer.add_instant(name, **args)
+
+
+def finish():
+    """Write the trace; later events are ignored. Safe to call repeatedly."""
+    if _tracer is None or _tracer.finished:
+        return
+    _tracer.finished = True
+    for index, finder in enumerate(sys.meta_path):
+        if isinstance(finder, _ImportTimer):
+            del sys.meta_path[index]
+            break
+    path = _tracer.write()
+    if path:
+        print(f"Startup trace written to: {path}")
@@ -0,0 +1,169 @@
+"""Application stylesheets.
+
+css/style.css is always applied. Rules for the dark and high contrast
+schemes go in style-dark.css, style-hc.css and style-hc-dark.css at the
+root of the resource prefix, where Adw.Application loads them itself and
+swaps them when the color scheme changes; they are not registered here a
+second time. StyleSheets only records how long each switch takes to
+restyle.
+
+Page stylesheets, css/pages/<name>.css, are parsed the first time a page
+is realized, so CSS for pages that are never opened is never parsed.
+Like every provider they apply to the whole display, so the page widget
+gets the page-<name> CSS class and page rules must be scoped under it.
+
+Stylesheets are read from the GResource bundle, or from the resource
+directory when the bundle does not contain them.
+"""
+
+import time
+
+import gi
+
+gi.require_version('Gtk', '4.0')
+gi.require_version('Adw', '1')
+
+from gi.repository import Gtk, Adw, Gio, GLib
+
+from {{ NEW_NAME }} import startup
+from {{ NEW_NAME }}.paths import get_resource_dir
+
+RESOURCE_PREFIX = '{{ GIORESOURCE_ID }}'
+
+BASE_STYLESHEET = "css/style.css"
+
+PAGE_STYLESHEET = "css/pages/{name}.css"
+PAGE_CSS_CLASS = "page-{name}"
+
+# Pages are applied above the base stylesheet
+PAGE_PRIORITY = Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 1
+
+
+def _on_parsing_error(provider, section, error, path):
+    location = section.get_start_location()
+    print(f"Warning: {path}:{location.lines + 1}:{location.line_chars + 1}: {error.message}")
+
+
+def load_provider(path):
+    """
+    Parse a stylesheet into a new provider.
+
+    Args:
+        path: Path relative to the resource prefix, e.g. "css/style.css"
+
+    Returns:
+        Gtk.CssProvider or None: None if the stylesheet does not exist
+    """
+    provider = Gtk.CssProvider()
+    provider.connect("parsing-error", _on_parsing_error, path)
+
+    resource_path = f"{RESOURCE_PREFIX}/{path}"
+    try:
+        Gio.resources_get_info(resource_path, Gio.ResourceLookupFlags.NONE)
+    except GLib.Error:
+        css_file = get_resource_dir() / path
+        if not css_file.exists():
+            return None
+        provider.load_from_path(str(css_file))
+        print(f"Loaded CSS from: {css_file}")
+        return provider
+
+    provider.load_from_resource(resource_path)
+    return provider
+
+
+class StyleSheets:
+    """
+    Stylesheets of one display.
+
+    Attributes:
+        timings: Seconds spent per stylesheet parse and per scheme switch,
+                 e.g. {"parse css/style.css": 0.002, "restyle dark": 0.004}
+    """
+
+    def __init__(self, display, style_manager=None):
+        self.display = display
+        self.style_manager = style_manager or Adw.StyleManager.get_for_display(display)
+        self.timings = {}
+        self._base = None
+        self._scheme = None
+        self._pages = {}
+
+    def _parse(self, path):
+        with startup.phase(f"css {path}"):
+            start = time.perf_counter()
+            provider = load_provider(path)
+            self.timings[f"parse {path}"] = time.perf_counter() - start
+        return provider
+
+    def _add(self, provider, priority):
+        Gtk.StyleContext.add_provider_for_display(self.display, provider, priority)
+
+    def load(self):
+        """Apply the base stylesheet and start timing color scheme switches."""
+        self._base = self._parse(BASE_STYLESHEET)
+        if self._base is None:
+            print("Warning: CSS file not found")
+        else:
+            self._add(self._base, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+
+        self._scheme = self._current_key()
+        self.style_manager.connect("notify::dark", self._on_scheme_changed)
+        self.style_manager.connect("notify::high-contrast", self._on_scheme_changed)
+
+    def _current_key(self):
+        return (self.style_manager.get_dark(), self.style_manager.get_high_contrast())
+
+    def _on_scheme_changed(self, style_manager, pspec):
+        key = self._current_key()
+        if key == self._scheme:
+            return
+        self._scheme = key
+        # Adw swaps its own providers, the next frame restyles once
+        self._measure_restyle(key, time.perf_counter())
+
+    def _measure_restyle(self, key, start):
+        """Record the time from the switch until the next frame is painted."""
+        name = "-".join(name for name, on in zip(("dark", "hc"), key) if on) or "light"
+        application = Gio.Application.get_default()
+        window = application.get_active_window() if application is not None else None
+        frame_clock = window.get_frame_clock() if window is not None and window.get_mapped() else None
+        if frame_clock is None:
+            self.timings[f"restyle {name}"] = time.perf_counter() - start
+            return
+
+        def on_after_paint(clock):
+            clock.disconnect(handler)
+            self.timings[f"restyle {name}"] = time.perf_counter() - start
+            startup.mark(f"restyle {name}", seconds=self.timings[f"restyle {name}"])
+
+        handler = frame_clock.connect("after-paint", on_after_paint)
+        window.queue_draw()
+
+    def attach_page(self, widget, name):
+        """
+        Apply css/pages/<name>.css once widget is first realized.
+
+        widget gets the page-<name> CSS class. The stylesheet is parsed
+        once and applies to the whole display, so its rules must be
+        scoped under that class, e.g. ".page-welcome label { ... }".
+        """
+        widget.add_css_class(PAGE_CSS_CLASS.format(name=name))
+        if name in self._pages:
+            return
+        if widget.get_realized():
+            self._attach_page(name)
+            return
+
+        def on_realize(widget):
+            widget.disconnect(handler)
+            self._attach_page(name)
+
+        handler = widget.connect("realize", on_realize)
+
+    def _attach_page(self, name):
+        if name not in self._pages:
+            provider = self._parse(PAGE_STYLESHEET.format(name=name))
+            self._pages[name] = provider
+            if provider is not None:
+                self._add(provider, PAGE_PRIORITY)
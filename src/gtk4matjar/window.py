@@ -5,7 +5,108 @@ import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 
+import time
+import types
+
 from gi.repository import Gtk, Adw, Gio, GLib,Pango
+from {{ NEW_NAME }} import settings, startup
+
+# Seconds of main loop time spent building sections per idle callback
+SECTION_TIME_BUDGET = 0.008
+
+
+class LazySection(Adw.Bin):
+    """
+    Placeholder whose content is built by a factory on demand.
+    
+    The factory is called with the section and either returns the root
+    widget, or is a generator that first yields the root widget and then
+    yields again after each chunk of further work (e.g. after appending a
+    batch of rows), so a large section can be built across several frames.
+    """
+    
+    __gtype_name__ = 'LazySection'
+    
+    def __init__(self, name, factory, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self._factory = factory
+        self._builder = None
+        self._built = False
+        self._idle_source = None
+        self.connect("map", self._on_map)
+        self.connect("unmap", self._on_unmap)
+    
+    @property
+    def built(self):
+        """Whether the section content is complete."""
+        return self._built
+    
+    def step(self):
+        """
+        Run one chunk of the factory.
+        
+        Returns:
+            bool: True once the section is fully built
+        """
+        if self._built:
+            return True
+        
+        with startup.phase(f"section {self.name}"):
+            if self._builder is None:
+                result = self._factory(self)
+                if isinstance(result, types.GeneratorType):
+                    self._builder = result
+                    result = next(result, None)
+                else:
+                    self._built = True
+                if result is not None:
+                    self.set_child(result)
+                return self._built
+            
+            try:
+                next(self._builder)
+            except StopIteration:
+                self._builder = None
+                self._built = True
+        return self._built
+    
+    def advance(self, budget):
+        """
+        Build until done or until the time budget is spent.
+        
+        Args:
+            budget: Seconds to spend, at least one chunk always runs
+            
+        Returns:
+            bool: True once the section is fully built
+        """
+        deadline = time.perf_counter() + budget
+        while not self.step():
+            if time.perf_counter() >= deadline:
+                return False
+        return True
+    
+    def build(self):
+        """Build the whole section now."""
+        while not self.step():
+            pass
+    
+    def _on_map(self, widget):
+        # Revealed: show what fits in a frame, finish the rest before anything else
+        if not self.advance(SECTION_TIME_BUDGET) and self._idle_source is None:
+            self._idle_source = GLib.idle_add(self._on_idle, priority=GLib.PRIORITY_HIGH_IDLE)
+    
+    def _on_unmap(self, widget):
+        if self._idle_source is not None:
+            GLib.source_remove(self._idle_source)
+            self._idle_source = None
+    
+    def _on_idle(self):
+        if self.advance(SECTION_TIME_BUDGET):
+            self._idle_source = None
+            return GLib.SOURCE_REMOVE
+        return GLib.SOURCE_CONTINUE
 
 
 @Gtk.Template(resource_path='{{ GIORESOURCE_ID }}/ui/window.ui')
@@ -19,12 +120,100 @@ class MainWindow(Adw.ApplicationWindow):
     main_content  = Gtk.Template.Child()
 
     def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+        with startup.phase("MainWindow template"):
+            super().__init__(**kwargs)
         self._app  = self.get_application()
 
+        self._sections = {}
+        self._pending_sections = []
+        self._sections_idle_source = None
+
+        with startup.phase("MainWindow content"):
+            self._build_content()
+
+        with startup.phase("setup_settings"):
+            self.setup_settings()
+
+        self.connect("map", self._on_map)
+        self.connect("unmap", self._on_unmap)
+
+    def _build_content(self):
+        """Build the window shell and register its sections."""
+        self.section_stack = Gtk.Stack()
+        self.section_stack.set_vexpand(True)
+        self.section_stack.set_transition_type(Gtk.StackTransitionType.CROSSFADE)
+        self.main_content.append(self.section_stack)
+
+        self.add_section("welcome", "Welcome", self._build_welcome_section)
+
+    def add_section(self, name, title, factory):
+        """
+        Register a section built on first reveal or while the main loop is idle.
+        
+        css/pages/<name>.css, if present, is applied when the section is
+        first realized; scope its rules under the page-<name> CSS class.
+        
+        Args:
+            name: Stack page name
+            title: Stack page title
+            factory: Callable taking the LazySection, see LazySection
+            
+        Returns:
+            LazySection: The placeholder added to the section stack
+        """
+        section = LazySection(name, factory)
+        styles = getattr(self._app, "styles", None)
+        if styles is not None:
+            styles.attach_page(section, name)
+        self.section_stack.add_titled(section, name, title)
+        self._sections[name] = section
+        self._pending_sections.append(section)
+        if self.get_mapped():
+            self._schedule_pending_sections()
+        return section
+
+    def get_section(self, name):
+        """Get a registered section by name."""
+        return self._sections.get(name)
+
+    def show_section(self, name):
+        """Reveal a section, building it if needed."""
+        self.section_stack.set_visible_child_name(name)
+
+    def _schedule_pending_sections(self):
+        if self._sections_idle_source is None:
+            self._sections_idle_source = GLib.idle_add(
+                self._on_build_pending_sections, priority=GLib.PRIORITY_LOW)
+
+    def _on_map(self, widget):
+        # Low priority idle runs after the first frame has been drawn
+        self._schedule_pending_sections()
+
+    def _on_unmap(self, widget):
+        if self._sections_idle_source is not None:
+            GLib.source_remove(self._sections_idle_source)
+            self._sections_idle_source = None
+        # Save the final geometry now rather than after the quiet period
+        self.app_settings.flush()
+
+    def _on_build_pending_sections(self):
+        """Build hidden sections, a time budget per main loop iteration."""
+        deadline = time.perf_counter() + SECTION_TIME_BUDGET
+        while self._pending_sections:
+            section = self._pending_sections[0]
+            if section.advance(max(deadline - time.perf_counter(), 0)):
+                self._pending_sections.pop(0)
+            if time.perf_counter() >= deadline:
+                break
+
+        if self._pending_sections:
+            return GLib.SOURCE_CONTINUE
+        self._sections_idle_source = None
+        return GLib.SOURCE_REMOVE
+
+    def _build_welcome_section(self, section):
         clamp = Adw.Clamp()
         clamp.set_maximum_size(600)
-        self.main_content.append(clamp)
 
         content_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=24)
         content_box.set_valign(Gtk.Align.CENTER)
@@ -53,13 +242,11 @@ class MainWindow(Adw.ApplicationWindow):
         button.set_halign(Gtk.Align.CENTER)
         button.connect("clicked", self._on_button_clicked)
         content_box.append(button)
+        return clamp
 
 
-
-        self.setup_settings()
-        
     def setup_settings(self):
-        self.app_settings = Gio.Settings.new_with_path("{{ ID_NAME }}" ,"{{ GIORESOURCE_ID }}/")
+        self.app_settings = settings.get_settings()
         self.app_settings.bind("width", self, "default-width",
                            Gio.SettingsBindFlags.DEFAULT)
         self.app_settings.bind("height", self, "default-height",